@@ -0,0 +1,126 @@
+import asyncio
+import weakref
+import aiohttp
+from auth import dataset_info_from_result
+from request_scheduler import AsyncRequestScheduler
+
+# Failures treated like dropped connections: retried only for idempotent methods
+NETWORK_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+# Event loop -> {Superset URL: AsyncRequestScheduler}, so every async client of a server shares its limits
+_SCHEDULERS = weakref.WeakKeyDictionary()
+
+
+def shared_scheduler(superset_url, **config):
+    """The AsyncRequestScheduler shared by all async clients of superset_url on the running loop.
+
+    The first client to ask creates it with its config; later clients reuse it.
+    """
+    schedulers = _SCHEDULERS.setdefault(asyncio.get_running_loop(), {})
+    if superset_url not in schedulers:
+        schedulers[superset_url] = AsyncRequestScheduler(**config)
+    return schedulers[superset_url]
+
+class AsyncSupersetAuth:
+    """Asyncio counterpart of SupersetAuth backed by a pooled aiohttp session.
+
+    Several instances can share one aiohttp.TCPConnector (pass ``connector``) so a
+    single event loop can drive many datasets/dashboards over the same pool while
+    each instance keeps its own cookies and tokens.
+    """
+
+    def __init__(self, superset_url, username, password, connector=None, pool_size=100, scheduler_config=None):
+        self.superset_url = superset_url
+        self.username = username
+        self.password = password
+        self.connector = connector
+        self.pool_size = pool_size
+        # RequestScheduler settings (see chart_configs.SCHEDULER_CONFIG) for this URL's shared scheduler
+        self.scheduler_config = scheduler_config or {}
+        self.session = None
+        self.headers = None
+
+    async def __aenter__(self):
+        await self.authenticate()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def authenticate(self):
+        """Authenticate with Superset and return session and headers"""
+        print("🔐 Authenticating (async)...")
+        if self.session is None or self.session.closed:
+            if self.connector is None:
+                connector = aiohttp.TCPConnector(limit=self.pool_size)
+                self.session = aiohttp.ClientSession(connector=connector)
+            else:
+                self.session = aiohttp.ClientSession(connector=self.connector, connector_owner=False)
+
+        await self._send("GET", f"{self.superset_url}/login/")
+
+        payload = {
+            "username": self.username,
+            "password": self.password,
+            "provider": "db"
+        }
+
+        status, data, text = await self._send("POST", f"{self.superset_url}/api/v1/security/login", json=payload)
+        if status != 200:
+            raise Exception(f"Login failed: {status} - {text}")
+        token = data["access_token"]
+
+        headers = {"Authorization": f"Bearer {token}"}
+        status, data, text = await self._send("GET", f"{self.superset_url}/api/v1/security/csrf_token/", headers=headers)
+        if status != 200:
+            raise Exception(f"Failed to get CSRF token: {status} - {text}")
+        csrf_token = data["result"]
+
+        self.headers = {
+            "Authorization": f"Bearer {token}",
+            "X-CSRFToken": csrf_token,
+            "Content-Type": "application/json",
+            "Referer": self.superset_url
+        }
+
+        print("✅ Authenticated")
+        return self.session, self.headers
+
+    async def close(self):
+        """Close the underlying aiohttp session (a shared connector is left open)"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def _send(self, method, url, **kwargs):
+        """One request through the URL's shared scheduler; returns (status, parsed JSON or None, raw text)"""
+        scheduler = shared_scheduler(self.superset_url, **self.scheduler_config)
+        connect_timeout, read_timeout = scheduler.timeout
+        kwargs.setdefault("timeout", aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout))
+
+        async def attempt():
+            async with self.session.request(method, url, **kwargs) as resp:
+                text = await resp.text()
+                try:
+                    data = await resp.json(content_type=None)
+                except ValueError:
+                    data = None
+                return resp.status, resp.headers.get("Retry-After"), (resp.status, data, text)
+
+        return await scheduler.send(method, url, attempt, network_errors=NETWORK_ERRORS)
+
+    async def request(self, method, path, **kwargs):
+        """Send an API request and return (status, parsed JSON or None, raw text)"""
+        if not self.session or not self.headers:
+            raise Exception("Not authenticated. Call authenticate() first.")
+
+        kwargs.setdefault("headers", self.headers)
+        return await self._send(method, f"{self.superset_url}{path}", **kwargs)
+
+    async def get_dataset_info(self, dataset_id):
+        """Get dataset information including columns and metrics"""
+        status, data, _ = await self.request("GET", f"/api/v1/dataset/{dataset_id}")
+        if status != 200:
+            print("❌ Failed to fetch dataset")
+            return None
+
+        return dataset_info_from_result(data["result"])
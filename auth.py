@@ -1,56 +1,227 @@
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from request_scheduler import RequestScheduler
+from session_store import DEFAULT_ACCESS_TTL, DEFAULT_REFRESH_TTL, token_expiry
+from superset_query import fetch_changed_on
+
+# Treat tokens this close to expiry as already expired
+EXPIRY_MARGIN = 60
+
+def dataset_info_from_result(data):
+    """Reduce a /api/v1/dataset/<id> result to column/metric names plus column metadata"""
+    return {
+        "columns": [c["column_name"] for c in data["columns"]],
+        "metrics": [m["metric_name"] for m in data["metrics"]],
+        "column_details": [
+            {
+                "column_name": c["column_name"],
+                "type": c.get("type"),
+                "is_dttm": c.get("is_dttm", False),
+                "groupby": c.get("groupby", True),
+                "filterable": c.get("filterable", True)
+            } for c in data["columns"]
+        ],
+        "main_dttm_col": data.get("main_dttm_col")
+    }
+
+class SupersetSession(requests.Session):
+    """requests.Session that sends through the auth's RequestScheduler and re-authenticates once on 401"""
+
+    def __init__(self, auth):
+        super().__init__()
+        self.superset_auth = auth
+        self.scheduler = auth.scheduler
+        # Mounted once: the scheduler never lets more requests than max_limit run at a time, so a
+        # pool of that size keeps every connection for reuse by the worker threads
+        pool_size = self.scheduler.limiter.max_limit
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def _send(self, method, url, *args, **kwargs):
+        """One scheduled request: rate limited, concurrency limited and retried on 429/503"""
+        kwargs.setdefault("timeout", self.scheduler.timeout)
+        return self.scheduler.send(method, url, lambda: super(SupersetSession, self).request(method, url, *args, **kwargs))
+
+    def request(self, method, url, *args, **kwargs):
+        resp = self._send(method, url, *args, **kwargs)
+        if resp.status_code != 401 or "/api/v1/security/" in url or not self.superset_auth.headers:
+            return resp
+        
+        headers = kwargs.get("headers") or {}
+        if not self.superset_auth.reauthenticate(failed_token=headers.get("Authorization")):
+            return resp
+        if not headers:
+            kwargs["headers"] = self.superset_auth.headers
+        elif headers is not self.superset_auth.headers:
+            kwargs["headers"] = {
+                **headers,
+                "Authorization": self.superset_auth.headers["Authorization"],
+                "X-CSRFToken": self.superset_auth.headers["X-CSRFToken"]
+            }
+        return self._send(method, url, *args, **kwargs)
 
 class SupersetAuth:
-    def __init__(self, superset_url, username, password):
+    def __init__(self, superset_url, username, password, cache=None, session_store=None, scheduler=None):
         self.superset_url = superset_url
         self.username = username
         self.password = password
+        self.cache = cache
+        self.session_store = session_store
+        # Shared by every request of this auth's session (charts, dashboards, listings)
+        self.scheduler = scheduler or RequestScheduler()
         self.session = None
         self.headers = None
+        self._tokens = {}
+        self._lock = threading.Lock()
     
     def authenticate(self):
-        """Authenticate with Superset and return session and headers"""
+        """Authenticate with Superset and return session and headers.
+
+        With a session_store, a stored unexpired login is reused and an expired access
+        token is renewed via the refresh endpoint; a full login happens only when neither works.
+        """
         print("🔐 Authenticating...")
-        self.session = requests.Session()
+        self.session = SupersetSession(self)
+        
+        if self.session_store and self._restore_session():
+            print("✅ Authenticated (reused stored session)")
+            return self.session, self.headers
+        
+        self._login()
+        print("✅ Authenticated")
+        return self.session, self.headers
+    
+    def reauthenticate(self, failed_token=None):
+        """Renew credentials after a 401, refreshing the token or logging in again"""
+        with self._lock:
+            if failed_token and self.headers and self.headers["Authorization"] != failed_token:
+                return True  # another thread already renewed the token
+            print("🔐 Session expired, re-authenticating...")
+            try:
+                if not self._refresh_access_token():
+                    self._login()
+            except requests.RequestException as e:
+                print(f"❌ Re-authentication failed: {e}")
+                return False
+            return True
+    
+    def _login(self):
+        """Full login: /login/ cookie, JWT login and CSRF token"""
         self.session.get(f"{self.superset_url}/login/")
         
         payload = {
             "username": self.username,
             "password": self.password,
-            "provider": "db"
+            "provider": "db",
+            "refresh": True
         }
         
         resp = self.session.post(f"{self.superset_url}/api/v1/security/login", json=payload)
         resp.raise_for_status()
         
-        token = resp.json()["access_token"]
+        tokens = resp.json()
+        token = tokens["access_token"]
         headers = {"Authorization": f"Bearer {token}"}
         
         csrf = self.session.get(f"{self.superset_url}/api/v1/security/csrf_token/", headers=headers)
         csrf.raise_for_status()
         
-        self.headers = {
-            "Authorization": f"Bearer {token}",
-            "X-CSRFToken": csrf.json()["result"],
+        self._tokens = {
+            "access_token": token,
+            "access_expires_at": token_expiry(token, DEFAULT_ACCESS_TTL),
+            "refresh_token": tokens.get("refresh_token"),
+            "refresh_expires_at": token_expiry(tokens.get("refresh_token"), DEFAULT_REFRESH_TTL),
+            "csrf_token": csrf.json()["result"]
+        }
+        self._apply_tokens()
+    
+    def _refresh_access_token(self):
+        """Get a new access token from the refresh token; False if there is no usable one"""
+        refresh_token = self._tokens.get("refresh_token")
+        if not refresh_token or self._tokens.get("refresh_expires_at", 0) - EXPIRY_MARGIN < time.time():
+            return False
+        
+        resp = self.session.post(
+            f"{self.superset_url}/api/v1/security/refresh",
+            headers={"Authorization": f"Bearer {refresh_token}"}
+        )
+        if resp.status_code != 200:
+            return False
+        
+        token = resp.json()["access_token"]
+        self._tokens["access_token"] = token
+        self._tokens["access_expires_at"] = token_expiry(token, DEFAULT_ACCESS_TTL)
+        self._apply_tokens()
+        return True
+    
+    def _restore_session(self):
+        """Load tokens and cookies from the session store; False if a full login is needed"""
+        entry = self.session_store.load(self.superset_url, self.username)
+        if not entry:
+            return False
+        
+        self.session.cookies.update(entry.get("cookies", {}))
+        self._tokens = entry["tokens"]
+        if self._tokens.get("access_expires_at", 0) - EXPIRY_MARGIN > time.time():
+            self._apply_tokens(save=False)
+            return True
+        return self._refresh_access_token()
+    
+    def _apply_tokens(self, save=True):
+        """Point the shared headers dict at the current tokens and persist them"""
+        headers = {
+            "Authorization": f"Bearer {self._tokens['access_token']}",
+            "X-CSRFToken": self._tokens["csrf_token"],
             "Content-Type": "application/json",
             "Referer": self.superset_url
         }
+        # Update in place: chart and dashboard managers hold a reference to this dict
+        if self.headers is None:
+            self.headers = headers
+        else:
+            self.headers.update(headers)
         
-        print("✅ Authenticated")
-        return self.session, self.headers
+        if save and self.session_store:
+            self.session_store.save(self.superset_url, self.username, {
+                "tokens": self._tokens,
+                "cookies": self.session.cookies.get_dict()
+            })
     
     def get_dataset_info(self, dataset_id):
         """Get dataset information including columns and metrics"""
         if not self.session or not self.headers:
             raise Exception("Not authenticated. Call authenticate() first.")
         
-        resp = self.session.get(f"{self.superset_url}/api/v1/dataset/{dataset_id}", headers=self.headers)
+        cached = self.cache.get(self.superset_url, "dataset", dataset_id) if self.cache else None
+        if cached and "column_details" not in cached["payload"]:
+            cached = None  # entry predates column profiles
+        if cached and cached["fresh"]:
+            return cached["payload"]
+        
+        # Revalidate: a tiny changed_on probe avoids downloading unchanged datasets
+        changed_on = None
+        headers = self.headers
+        if self.cache:
+            changed_on = fetch_changed_on(self.session, self.superset_url, self.headers, "dataset", dataset_id)
+            if cached and changed_on and cached["changed_on"] == changed_on:
+                self.cache.touch(self.superset_url, "dataset", dataset_id)
+                return cached["payload"]
+            if cached and cached["etag"]:
+                headers = {**self.headers, "If-None-Match": cached["etag"]}
+        
+        resp = self.session.get(f"{self.superset_url}/api/v1/dataset/{dataset_id}", headers=headers)
+        if resp.status_code == 304 and cached:
+            self.cache.touch(self.superset_url, "dataset", dataset_id, changed_on)
+            return cached["payload"]
         if resp.status_code != 200:
             print("❌ Failed to fetch dataset")
             return None
         
-        data = resp.json()["result"]
-        return {
-            "columns": [c["column_name"] for c in data["columns"]],
-            "metrics": [m["metric_name"] for m in data["metrics"]]
-        }
\ No newline at end of file
+        info = dataset_info_from_result(resp.json()["result"])
+        if self.cache:
+            self.cache.put(self.superset_url, "dataset", dataset_id, info,
+                           etag=resp.headers.get("ETag"), changed_on=changed_on)
+        return info
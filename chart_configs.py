@@ -7,12 +7,61 @@ SUPERSET_CONFIG = {
     "password": "admin"
 }
 
+# Superset deployments provisioned by fanout.py. Each entry needs name/url/username/password;
+# dataset_id, dashboard_title and max_workers default to the settings below, and "scheduler"
+# overrides SCHEDULER_CONFIG keys for that environment.
+SUPERSET_ENVIRONMENTS = [
+    {"name": "local", **SUPERSET_CONFIG},
+    # {"name": "acme-prod", "url": "https://bi.acme.example.com", "username": "svc_charts",
+    #  "password": "...", "dataset_id": 12, "max_workers": 4},
+]
+
+# Environments provisioned at once by fanout.py (each with its own session and cache)
+FANOUT_MAX_TARGETS = 8
+
+# Persistent metadata cache (datasets, chart and dashboard listings).
+# Entries younger than ttl seconds are used as-is; older ones are revalidated.
+CACHE_CONFIG = {
+    "path": ".superset_cache.sqlite",
+    "ttl": 600
+}
+
+# Scheduling of every Superset HTTP request: at most `rate` requests/s (None = unlimited),
+# requests in flight adapted between 1 and max_concurrency (halved when responses get slower
+# than latency_target seconds), 429/503 retried with backoff honoring Retry-After
+SCHEDULER_CONFIG = {
+    "rate": 20,
+    "burst": 40,
+    "max_concurrency": 16,
+    "initial_concurrency": 8,
+    "latency_target": 10.0,
+    "max_retries": 4
+}
+
+# Stored login (tokens, CSRF token, cookies) reused across script runs
+SESSION_STORE_PATH = ".superset_session.json"
+
 # Dataset and dashboard settings
 DATASET_ID = 1
 DASHBOARD_TITLE = "Analytics Dashboard"
 UPDATE_MODE = True
 
+# Max chart create/update requests in flight at once (1 = sequential)
+MAX_WORKERS = 8
+
+# Only update existing charts whose stored params/query_context differ;
+# DRY_RUN prints the create/update/no-op plan without sending anything
+RECONCILE_MODE = True
+DRY_RUN = False
+
+# Create DASHBOARD_TITLE if needed and place every processed chart on it in one layout update
+AUTO_UPDATE_DASHBOARD = False
+
+# Print full chart payloads while building/sending them (slow for large batches)
+DEBUG_PAYLOADS = False
+
 # === CHART CONFIGURATIONS ===
+# Optional per-chart "tab": charts sharing a tab name are grouped into one dashboard tab
 
 # Big Number Charts (known to work)
 BIG_NUMBER_CHARTS = [
@@ -1,117 +1,197 @@
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from auth import SupersetAuth
+from column_index import DatasetColumnIndex
 from dashboard_manager import SupersetDashboardManager
+from import_bundle import SupersetBundleImporter
+from superset_query import (fetch_listing_signature, find_charts, find_chart_id, iter_resource, iter_resource_async,
+                            make_filters)
+
+# Only the fields the name index needs are requested from the chart listing
+CHART_INDEX_COLUMNS = ["id", "slice_name", "datasource_id"]
+# Fields plan_charts diffs against, read from the listing (100 charts per request) instead of per chart
+CHART_PLAN_COLUMNS = ["id", "slice_name", "viz_type", "datasource_id", "params", "query_context"]
+
+# Fields Superset expects in query_context.form_data on top of the chart params
+QUERY_CONTEXT_FORM_DATA_EXTRAS = {"force": False, "result_format": "json", "result_type": "full"}
+
+# Query fields every chart type starts from (shared by the payload templates; never modify in place)
+QUERY_DEFAULTS = {
+    "filters": [],
+    "extras": {"having": "", "where": ""},
+    "applied_time_extras": {},
+    "columns": [],
+    "annotation_layers": [],
+    "series_limit": 0,
+    "order_desc": True,
+    "url_params": {},
+    "custom_params": {},
+    "custom_form_data": {}
+}
 
 class SupersetChartCreator:
-    def __init__(self, auth_instance):
+    def __init__(self, auth_instance, debug=False):
         self.auth = auth_instance
+        self.debug = debug
         self.session = auth_instance.session
         self.headers = auth_instance.headers
         self.superset_url = auth_instance.superset_url
         self._existing_charts = None
+        self._templates = {}
+        self.cache = getattr(auth_instance, "cache", None)
         # Initialize dashboard manager
         self.dashboard_manager = SupersetDashboardManager(auth_instance)
+        self.bundle_importer = SupersetBundleImporter(auth_instance)
     
-    def select_column(self, columns, kind="date"):
-        """Smart column selection based on column names"""
-        if kind == "date":
-            for col in columns:
-                if any(k in col.lower() for k in ["date", "time", "timestamp"]):
-                    return col
-        elif kind == "category":
-            for col in columns:
-                if not any(k in col.lower() for k in ["id", "amount", "count"]):
-                    return col
-        elif kind == "numeric":
-            for col in columns:
-                if any(k in col.lower() for k in ["amount", "value", "price", "score", "count", "number"]):
-                    return col
-        return None
+    # === PAYLOAD TEMPLATES ===
+
+    def _dataset_template(self, dataset_id, dataset_info):
+        """Dataset-level values shared by every chart built for this dataset, computed once"""
+        template = self._templates.get(dataset_id)
+        if template is None or template["columns"] is not dataset_info["columns"]:
+            column_index = DatasetColumnIndex.from_dataset_info(dataset_info)
+            template = {
+                "columns": dataset_info["columns"],
+                "datasource": f"{dataset_id}__table",
+                "query_datasource": {"id": dataset_id, "type": "table"},
+                "date_col": column_index.best("temporal"),
+                "category_col": column_index.best("categorical"),
+                "numeric_col": column_index.best("numeric"),
+                # Chart-independent payload parts per chart builder, filled in on first use
+                "payloads": {}
+            }
+            self._templates[dataset_id] = template
+        return template
+
+    def _payload_template(self, dataset_id, dataset_info, name, build):
+        """Chart-independent form_data and query fields of one chart builder, built once per dataset.
+
+        build(dataset_template) returns {"form_data": {...}, "query": {...}}; builders copy
+        these and add only the fields that depend on the chart config. Templates are shared,
+        so their nested values must never be modified.
+        """
+        dataset = self._dataset_template(dataset_id, dataset_info)
+        template = dataset["payloads"].get(name)
+        if template is None:
+            template = build(dataset)
+            dataset["payloads"][name] = template
+        return template
+
+    def _serialize_payload(self, chart_name, viz_type, dataset_id, form_data, query, template):
+        """Build the chart payload: params is form_data, query_context wraps the query.
+
+        Superset expects form_data (plus a few extras) again inside query_context, so it is
+        encoded in both JSON strings.
+        """
+        query_context = {
+            "datasource": template["query_datasource"],
+            "force": False,
+            "queries": [query],
+            "form_data": {**form_data, **QUERY_CONTEXT_FORM_DATA_EXTRAS},
+            "result_format": "json",
+            "result_type": "full"
+        }
+        return {
+            "slice_name": chart_name,
+            "viz_type": viz_type,
+            "datasource_id": dataset_id,
+            "datasource_type": "table",
+            "params": json.dumps(form_data),
+            "query_context": json.dumps(query_context)
+        }
 
     # === CHART TYPE SPECIFIC METHODS ===
 
+    def _big_number_template(self, dataset):
+        """Fields of big_number_total charts that only depend on the dataset"""
+        date_col = dataset["date_col"]
+        return {
+            "form_data": {
+                "datasource": dataset["datasource"],
+                "viz_type": "big_number_total",
+                "adhoc_filters": [
+                    {
+                        "clause": "WHERE",
+                        "subject": date_col,
+                        "operator": "TEMPORAL_RANGE",
+                        "comparator": "No filter",
+                        "expressionType": "SIMPLE"
+                    }
+                ] if date_col else [],
+                "extra_form_data": {},
+                "dashboards": []
+            },
+            "query": {
+                **QUERY_DEFAULTS,
+                "filters": [
+                    {
+                        "col": date_col or "date",
+                        "op": "TEMPORAL_RANGE",
+                        "val": "No filter"
+                    }
+                ] if date_col else []
+            }
+        }
+
     def _build_big_number_chart(self, chart_config, dataset_id, dataset_info):
         """Build payload specifically for big_number_total charts"""
         chart_name = chart_config["name"]
         metric = chart_config.get("metric", "count")
+        template = self._payload_template(dataset_id, dataset_info, "big_number_total", self._big_number_template)
+        dataset = self._dataset_template(dataset_id, dataset_info)
+        custom_params = chart_config.get("custom_params", {})
         
         # Big number specific form_data
         form_data = {
-            "datasource": f"{dataset_id}__table",
-            "viz_type": "big_number_total",
+            **template["form_data"],
             "metric": metric,
-            "adhoc_filters": [
-                {
-                    "clause": "WHERE",
-                    "subject": "date" if self.select_column(dataset_info["columns"], "date") else None,
-                    "operator": "TEMPORAL_RANGE",
-                    "comparator": "No filter",
-                    "expressionType": "SIMPLE"
-                }
-            ] if self.select_column(dataset_info["columns"], "date") else [],
-            "header_font_size": chart_config.get("custom_params", {}).get("header_font_size", 0.4),
-            "subheader_font_size": chart_config.get("custom_params", {}).get("subheader_font_size", 0.15),
-            "y_axis_format": chart_config.get("custom_params", {}).get("y_axis_format", "SMART_NUMBER"),
-            "time_format": chart_config.get("custom_params", {}).get("time_format", "smart_date"),
-            "extra_form_data": {},
-            "dashboards": []
+            "header_font_size": custom_params.get("header_font_size", 0.4),
+            "subheader_font_size": custom_params.get("subheader_font_size", 0.15),
+            "y_axis_format": custom_params.get("y_axis_format", "SMART_NUMBER"),
+            "time_format": custom_params.get("time_format", "smart_date")
         }
         
         # Add any additional custom params
-        if "custom_params" in chart_config:
-            for key, value in chart_config["custom_params"].items():
-                if key not in form_data:  # Don't override existing keys
-                    form_data[key] = value
-        
-        # Big number specific query_context
-        query_context = {
-            "datasource": {"id": dataset_id, "type": "table"},
-            "force": False,
-            "queries": [
-                {
-                    "filters": [
-                        {
-                            "col": self.select_column(dataset_info["columns"], "date") or "date",
-                            "op": "TEMPORAL_RANGE",
-                            "val": "No filter"
-                        }
-                    ] if self.select_column(dataset_info["columns"], "date") else [],
-                    "extras": {"having": "", "where": ""},
-                    "applied_time_extras": {},
-                    "columns": [],
-                    "metrics": [metric],
-                    "annotation_layers": [],
-                    "series_limit": 0,
-                    "order_desc": True,
-                    "url_params": {},
-                    "custom_params": {},
-                    "custom_form_data": {}
-                }
-            ],
-            "form_data": form_data.copy(),
-            "result_format": "json",
-            "result_type": "full"
-        }
+        for key, value in custom_params.items():
+            if key not in form_data:  # Don't override existing keys
+                form_data[key] = value
         
-        # Add required fields to form_data for query_context
-        query_context["form_data"].update({
-            "force": False,
-            "result_format": "json",
-            "result_type": "full"
-        })
+        query = {**template["query"], "metrics": [metric]}
         
+        return self._serialize_payload(chart_name, "big_number_total", dataset_id, form_data, query, dataset)
+
+    def _line_template(self, dataset):
+        """Fields of line charts that don't depend on the metric or X-axis"""
         return {
-            "slice_name": chart_name,
-            "viz_type": "big_number_total",
-            "datasource_id": dataset_id,
-            "datasource_type": "table",
-            "params": json.dumps(form_data),
-            "query_context": json.dumps(query_context)
+            "form_data": {
+                "datasource": dataset["datasource"],
+                "viz_type": "line",
+                "adhoc_filters": [],
+                "columns": [],
+                
+                # Axis formatting
+                "bottom_margin": "auto",
+                "x_ticks_layout": "auto",
+                "left_margin": "auto",
+                
+                # Additional options
+                "rolling_type": "None",
+                "comparison_type": "values",
+                "annotation_layers": [],
+                "extra_form_data": {},
+                "dashboards": []
+            },
+            # order_desc False gives better categorical ordering
+            "query": {**QUERY_DEFAULTS, "order_desc": False}
         }
 
     def _build_line_chart(self, chart_config, dataset_id, dataset_info):
         """Build payload for basic line charts - FIXED for categorical X-axis"""
         chart_name = chart_config["name"]
+        template = self._payload_template(dataset_id, dataset_info, "line", self._line_template)
+        dataset = self._dataset_template(dataset_id, dataset_info)
+        custom_params = chart_config.get("custom_params", {})
         
         # Handle metric configuration
         raw_metric = chart_config.get("metric", "AVG(nps_score)")
@@ -155,7 +235,7 @@ class SupersetChartCreator:
         # Check if we need to extract day of week from date
         if x_axis_config == "day_of_week":
             # Use SQL to extract day of week from date column
-            date_col = self.select_column(dataset_info["columns"], "date") or "date"
+            date_col = dataset["date_col"] or "date"
             
             # Create a custom column for day of week
             day_of_week_column = {
@@ -172,7 +252,7 @@ class SupersetChartCreator:
             
         elif x_axis_config == "month":
             # Extract month from date
-            date_col = self.select_column(dataset_info["columns"], "date") or "date"
+            date_col = dataset["date_col"] or "date"
             
             month_column = {
                 "expressionType": "SQL", 
@@ -196,21 +276,12 @@ class SupersetChartCreator:
             # Default to time-series behavior
             is_temporal = True
             groupby_columns = []
-            granularity_col = self.select_column(dataset_info["columns"], "date") or "date"
+            granularity_col = dataset["date_col"] or "date"
         
-        # Build form_data
-        form_data = {
-            "datasource": f"{dataset_id}__table",
-            "viz_type": "line",
-            "slice_id": None,
-            
-            # Metrics
+        # Chart-specific form_data (metrics, grouping, time and appearance)
+        chart_fields = {
             "metrics": [adhoc_metric],
-            "adhoc_filters": [],
-            
-            # Grouping configuration
             "groupby": groupby_columns if not is_temporal else [],
-            "columns": [],
             
             # Time configuration (only for temporal charts)
             "granularity_sqla": granularity_col if is_temporal else None,
@@ -218,87 +289,84 @@ class SupersetChartCreator:
             "time_range": "No filter" if is_temporal else None,
             
             # Chart appearance
-            "row_limit": chart_config.get("custom_params", {}).get("row_limit", 10000),
-            "color_scheme": chart_config.get("custom_params", {}).get("color_scheme", "supersetColors"),
+            "row_limit": custom_params.get("row_limit", 10000),
+            "color_scheme": custom_params.get("color_scheme", "supersetColors"),
             "show_brush": "auto" if is_temporal else False,
             "send_time_range": is_temporal,
-            "show_legend": chart_config.get("custom_params", {}).get("show_legend", True),
-            "rich_tooltip": chart_config.get("custom_params", {}).get("rich_tooltip", True),
-            "show_markers": chart_config.get("custom_params", {}).get("show_markers", True),
-            "line_interpolation": chart_config.get("custom_params", {}).get("line_interpolation", "linear"),
-            
-            # Axis formatting
-            "bottom_margin": "auto",
-            "x_ticks_layout": "auto",
+            "show_legend": custom_params.get("show_legend", True),
+            "rich_tooltip": custom_params.get("rich_tooltip", True),
+            "show_markers": custom_params.get("show_markers", True),
+            "line_interpolation": custom_params.get("line_interpolation", "linear"),
             "x_axis_format": "smart_date" if is_temporal else "",
-            "left_margin": "auto",
-            "y_axis_format": chart_config.get("custom_params", {}).get("y_axis_format", "SMART_NUMBER"),
-            "y_axis_bounds": chart_config.get("custom_params", {}).get("y_axis_bounds", [None, None]),
-            
-            # Additional options
-            "rolling_type": "None",
-            "comparison_type": "values",
-            "annotation_layers": [],
-            "extra_form_data": {},
-            "dashboards": []
+            "y_axis_format": custom_params.get("y_axis_format", "SMART_NUMBER"),
+            "y_axis_bounds": custom_params.get("y_axis_bounds", [None, None])
         }
         
         # Remove None values to avoid issues
-        form_data = {k: v for k, v in form_data.items() if v is not None}
+        form_data = {**template["form_data"], **{k: v for k, v in chart_fields.items() if v is not None}}
         
-        # Query context
-        query_context = {
-            "datasource": {"id": dataset_id, "type": "table"},
-            "force": False,
-            "queries": [
-                {
-                    "filters": [],
-                    "extras": {"having": "", "where": ""},
-                    "applied_time_extras": {},
-                    "columns": groupby_columns if not is_temporal else [],
-                    "metrics": [adhoc_metric],
-                    "groupby": groupby_columns if not is_temporal else [],
-                    "annotation_layers": [],
-                    "row_limit": form_data["row_limit"],
-                    "series_limit": 0,
-                    "order_desc": False,  # Changed to False for better categorical ordering
-                    "url_params": {},
-                    "custom_params": {},
-                    "custom_form_data": {}
-                }
-            ],
-            "form_data": form_data.copy(),
-            "result_format": "json",
-            "result_type": "full"
+        query = {
+            **template["query"],
+            "columns": groupby_columns if not is_temporal else [],
+            "metrics": [adhoc_metric],
+            "groupby": groupby_columns if not is_temporal else [],
+            "row_limit": form_data["row_limit"]
         }
         
         # Add temporal fields only if needed
         if is_temporal:
-            query_context["queries"][0]["time_range"] = "No filter"
-            query_context["queries"][0]["granularity"] = granularity_col
-            query_context["queries"][0]["extras"]["time_grain_sqla"] = "P1D"
-        
-        query_context["form_data"].update({
-            "force": False,
-            "result_format": "json",
-            "result_type": "full"
-        })
+            query["time_range"] = "No filter"
+            query["granularity"] = granularity_col
+            query["extras"] = {**query["extras"], "time_grain_sqla": "P1D"}
         
+        return self._serialize_payload(chart_name, "line", dataset_id, form_data, query, dataset)
+
+    def _bar_template(self, dataset):
+        """Everything of daily bar (line) charts except the metric"""
+        date_col = dataset["date_col"] or "date"
         return {
-            "slice_name": chart_name,
-            "viz_type": "line",
-            "datasource_id": dataset_id,
-            "datasource_type": "table",
-            "params": json.dumps(form_data),
-            "query_context": json.dumps(query_context)
+            "form_data": {
+                "datasource": dataset["datasource"],
+                "viz_type": "line",
+                "granularity_sqla": date_col,
+                "time_grain_sqla": "P1D",
+                "time_range": "No filter",
+                "adhoc_filters": [],
+                "groupby": [],
+                "row_limit": 10000,
+                "color_scheme": "supersetColors",
+                "show_brush": "auto",
+                "send_time_range": False,
+                "show_legend": True,
+                "rich_tooltip": True,
+                "show_markers": True,
+                "line_interpolation": "linear",
+                "bottom_margin": "auto",
+                "x_ticks_layout": "auto",
+                "x_axis_format": "smart_date",
+                "left_margin": "auto",
+                "y_axis_format": "SMART_NUMBER",
+                "y_axis_bounds": [None, None],
+                "rolling_type": "None",
+                "comparison_type": "values",
+                "annotation_layers": [],
+                "extra_form_data": {},
+                "dashboards": []
+            },
+            "query": {
+                **QUERY_DEFAULTS,
+                "time_range": "No filter",
+                "granularity": date_col,
+                "extras": {"time_grain_sqla": "P1D", "having": "", "where": ""},
+                "row_limit": 10000
+            }
         }
 
     def _build_bar_chart(self, chart_config, dataset_id, dataset_info):
         chart_name = chart_config["name"]
         metric_col = chart_config.get("metric", "nps_score")
-        
-        # Get date column
-        date_col = self.select_column(dataset_info["columns"], "date") or "date"
+        template = self._payload_template(dataset_id, dataset_info, "bar", self._bar_template)
+        dataset = self._dataset_template(dataset_id, dataset_info)
         
         # Create SQL expression metric
         sql_metric = {
@@ -308,156 +376,69 @@ class SupersetChartCreator:
             "hasCustomLabel": False
         }
         
-        form_data = {
-            "datasource": f"{dataset_id}__table",
-            "viz_type": "line",
-            "granularity_sqla": date_col,
-            "time_grain_sqla": "P1D",
-            "time_range": "No filter",
-            "metrics": [sql_metric],
-            "adhoc_filters": [],
-            "groupby": [],
-            "row_limit": 10000,
-            "color_scheme": "supersetColors",
-            "show_brush": "auto",
-            "send_time_range": False,
-            "show_legend": True,
-            "rich_tooltip": True,
-            "show_markers": True,
-            "line_interpolation": "linear",
-            "bottom_margin": "auto",
-            "x_ticks_layout": "auto",
-            "x_axis_format": "smart_date",
-            "left_margin": "auto",
-            "y_axis_format": "SMART_NUMBER",
-            "y_axis_bounds": [None, None],
-            "rolling_type": "None",
-            "comparison_type": "values",
-            "annotation_layers": [],
-            "extra_form_data": {},
-            "dashboards": []
-        }
-        
-        # Query context with SQL metric
-        query_context = {
-            "datasource": {"id": dataset_id, "type": "table"},
-            "force": False,
-            "queries": [
-                {
-                    "time_range": "No filter",
-                    "granularity": date_col,
-                    "filters": [],
-                    "extras": {"time_grain_sqla": "P1D", "having": "", "where": ""},
-                    "applied_time_extras": {},
-                    "columns": [],
-                    "metrics": [sql_metric],
-                    "annotation_layers": [],
-                    "row_limit": 10000,
-                    "series_limit": 0,
-                    "order_desc": True,
-                    "url_params": {},
-                    "custom_params": {},
-                    "custom_form_data": {}
-                }
-            ],
-            "form_data": form_data.copy(),
-            "result_format": "json",
-            "result_type": "full"
-        }
-        
-        query_context["form_data"].update({
-            "force": False,
-            "result_format": "json",
-            "result_type": "full"
-        })
+        form_data = {**template["form_data"], "metrics": [sql_metric]}
+        query = {**template["query"], "metrics": [sql_metric]}
         
+        return self._serialize_payload(chart_name, "line", dataset_id, form_data, query, dataset)
+
+    def _bubble_template(self, dataset):
+        """Fields of bubble charts that don't depend on the chart config"""
         return {
-            "slice_name": chart_name,
-            "viz_type": "line",
-            "datasource_id": dataset_id,
-            "datasource_type": "table",
-            "params": json.dumps(form_data),
-            "query_context": json.dumps(query_context)
+            "form_data": {
+                "datasource": dataset["datasource"],
+                "viz_type": "bubble",
+                "adhoc_filters": [],
+                "time_range": "No filter",
+                "extra_form_data": {},
+                "dashboards": []
+            },
+            "query": dict(QUERY_DEFAULTS)
         }
 
     def _build_bubble_chart(self, chart_config, dataset_id, dataset_info):
         """Build payload specifically for bubble charts"""
         chart_name = chart_config["name"]
         metric = chart_config.get("metric", "count")
+        template = self._payload_template(dataset_id, dataset_info, "bubble", self._bubble_template)
+        dataset = self._dataset_template(dataset_id, dataset_info)
+        custom_params = chart_config.get("custom_params", {})
         
         # Get x and y columns (numeric preferred)
-        x_col = chart_config.get("custom_params", {}).get("x") or self.select_column(dataset_info["columns"], "numeric")
-        y_col = chart_config.get("custom_params", {}).get("y") or self.select_column(dataset_info["columns"], "numeric")
-        size_metric = chart_config.get("custom_params", {}).get("size", metric)
+        x_col = custom_params.get("x") or dataset["numeric_col"]
+        y_col = custom_params.get("y") or dataset["numeric_col"]
+        size_metric = custom_params.get("size", metric)
         
         # Series column for grouping bubbles
-        series_col = chart_config.get("custom_params", {}).get("series") or self.select_column(dataset_info["columns"], "category")
+        series_col = custom_params.get("series") or dataset["category_col"]
         
         # Bubble chart specific form_data
         form_data = {
-            "datasource": f"{dataset_id}__table",
-            "viz_type": "bubble",
+            **template["form_data"],
             "x": x_col,
             "y": y_col,
             "size": size_metric,
             "series": series_col,
-            "entity": chart_config.get("custom_params", {}).get("entity", ""),
-            "adhoc_filters": [],
-            "time_range": "No filter",
-            "row_limit": chart_config.get("custom_params", {}).get("row_limit", 100),
-            "show_legend": chart_config.get("custom_params", {}).get("show_legend", True),
-            "max_bubble_size": chart_config.get("custom_params", {}).get("max_bubble_size", 25),
-            "color_scheme": chart_config.get("custom_params", {}).get("color_scheme", "supersetColors"),
-            "extra_form_data": {},
-            "dashboards": []
+            "entity": custom_params.get("entity", ""),
+            "row_limit": custom_params.get("row_limit", 100),
+            "show_legend": custom_params.get("show_legend", True),
+            "max_bubble_size": custom_params.get("max_bubble_size", 25),
+            "color_scheme": custom_params.get("color_scheme", "supersetColors")
         }
         
         # Add any additional custom params
-        if "custom_params" in chart_config:
-            for key, value in chart_config["custom_params"].items():
-                if key not in form_data:
-                    form_data[key] = value
+        for key, value in custom_params.items():
+            if key not in form_data:
+                form_data[key] = value
         
-        # Bubble chart specific query_context
-        query_context = {
-            "datasource": {"id": dataset_id, "type": "table"},
-            "force": False,
-            "queries": [
-                {
-                    "filters": [],
-                    "extras": {"having": "", "where": ""},
-                    "applied_time_extras": {},
-                    "columns": [col for col in [x_col, y_col, series_col] if col],
-                    "metrics": [size_metric] if isinstance(size_metric, str) else [size_metric],
-                    "groupby": [series_col] if series_col else [],
-                    "annotation_layers": [],
-                    "row_limit": form_data["row_limit"],
-                    "series_limit": 0,
-                    "order_desc": True,
-                    "url_params": {},
-                    "custom_params": {},
-                    "custom_form_data": {}
-                }
-            ],
-            "form_data": form_data.copy(),
-            "result_format": "json",
-            "result_type": "full"
+        query = {
+            **template["query"],
+            "columns": [col for col in [x_col, y_col, series_col] if col],
+            "metrics": [size_metric],
+            "groupby": [series_col] if series_col else [],
+            "row_limit": form_data["row_limit"]
         }
         
-        query_context["form_data"].update({
-            "force": False,
-            "result_format": "json",
-            "result_type": "full"
-        })
-        
-        return {
-            "slice_name": chart_name,
-            "viz_type": "bubble",
-            "datasource_id": dataset_id,
-            "datasource_type": "table",
-            "params": json.dumps(form_data),
-            "query_context": json.dumps(query_context)
-        }
+        return self._serialize_payload(chart_name, "bubble", dataset_id, form_data, query, dataset)
 
     # === MAIN CHART BUILDING METHOD ===
     
@@ -465,9 +446,9 @@ class SupersetChartCreator:
         """Route to specific chart building method based on viz_type"""
         viz_type = chart_config["viz_type"]
         
-        print(f"🔧 Building {viz_type} chart: {chart_config['name']}")
-        print("chart_config: ", chart_config)
-        print(viz_type)
+        if self.debug:
+            print(f"🔧 Building {viz_type} chart: {chart_config['name']}")
+            print("chart_config: ", chart_config)
         # Route to specific method based on chart type
         if viz_type == "big_number_total":
             return self._build_big_number_chart(chart_config, dataset_id, dataset_info)
@@ -481,21 +462,30 @@ class SupersetChartCreator:
             print(f"⚠️ Unsupported chart type: {viz_type}. Using generic method.")
             return self._build_generic_chart(chart_config, dataset_id, dataset_info)
     
+    def _generic_template(self, dataset, viz_type):
+        """Fields of charts built by the generic method that don't depend on the chart config"""
+        return {
+            "form_data": {
+                "datasource": dataset["datasource"],
+                "viz_type": viz_type,
+                "adhoc_filters": [],
+                "time_range": "No filter",
+                "dashboards": []
+            },
+            "query": dict(QUERY_DEFAULTS)
+        }
+
     def _build_generic_chart(self, chart_config, dataset_id, dataset_info):
         """Fallback method for unsupported chart types"""
         chart_name = chart_config["name"]
         viz_type = chart_config["viz_type"]
         metric = chart_config.get("metric", "count")
+        template = self._payload_template(dataset_id, dataset_info, f"generic:{viz_type}",
+                                          lambda dataset: self._generic_template(dataset, viz_type))
+        dataset = self._dataset_template(dataset_id, dataset_info)
         
         # Generic form_data
-        form_data = {
-            "datasource": f"{dataset_id}__table",
-            "viz_type": viz_type,
-            "slice_name": chart_name,
-            "adhoc_filters": [],
-            "time_range": "No filter",
-            "dashboards": []
-        }
+        form_data = {**template["form_data"], "slice_name": chart_name}
         
         # Add metric
         if viz_type == "big_number_total":
@@ -506,11 +496,11 @@ class SupersetChartCreator:
         # Add groupby if specified
         if chart_config.get("groupby_type"):
             if chart_config["groupby_type"] == "date":
-                groupby_col = self.select_column(dataset_info["columns"], "date")
+                groupby_col = dataset["date_col"]
                 if groupby_col:
                     form_data["groupby"] = [groupby_col]
             elif chart_config["groupby_type"] == "category":
-                groupby_col = self.select_column(dataset_info["columns"], "category")
+                groupby_col = dataset["category_col"]
                 if groupby_col:
                     form_data["groupby"] = [groupby_col]
         
@@ -518,88 +508,121 @@ class SupersetChartCreator:
         if "custom_params" in chart_config:
             form_data.update(chart_config["custom_params"])
         
-        # Generic query_context
-        query_context = {
-            "datasource": {"id": dataset_id, "type": "table"},
-            "force": False,
-            "queries": [
-                {
-                    "filters": [],
-                    "extras": {"having": "", "where": ""},
-                    "applied_time_extras": {},
-                    "columns": [],
-                    "metrics": form_data.get("metrics", [form_data.get("metric", metric)]),
-                    "groupby": form_data.get("groupby", []),
-                    "annotation_layers": [],
-                    "series_limit": 0,
-                    "order_desc": True,
-                    "url_params": {},
-                    "custom_params": {},
-                    "custom_form_data": {}
-                }
-            ],
-            "form_data": form_data.copy(),
-            "result_format": "json",
-            "result_type": "full"
+        query = {
+            **template["query"],
+            "metrics": form_data.get("metrics", [form_data.get("metric", metric)]),
+            "groupby": form_data.get("groupby", [])
         }
         
-        query_context["form_data"].update({
-            "force": False,
-            "result_format": "json",
-            "result_type": "full"
-        })
-        
-        return {
-            "slice_name": chart_name,
-            "viz_type": viz_type,
-            "datasource_id": dataset_id,
-            "datasource_type": "table",
-            "params": json.dumps(form_data),
-            "query_context": json.dumps(query_context)
-        }
+        return self._serialize_payload(chart_name, viz_type, dataset_id, form_data, query, dataset)
 
     # === EXISTING METHODS (unchanged) ===
     
     def create_chart(self, chart_config, dataset_id, dataset_info):
         """Create a single chart based on configuration"""
         payload = self._build_chart_payload(chart_config, dataset_id, dataset_info)
-        print(f"[DEBUG] Chart payload for '{chart_config['name']}':\n{json.dumps(payload, indent=2)}")
+        if self.debug:
+            print(f"[DEBUG] Chart payload for '{chart_config['name']}':\n{json.dumps(payload, indent=2)}")
+        return self._post_chart(chart_config["name"], payload, dataset_id)
+    
+    def update_chart(self, chart_id, chart_config, dataset_id, dataset_info):
+        """Update an existing chart"""
+        payload = self._build_chart_payload(chart_config, dataset_id, dataset_info)
+        if self.debug:
+            print(f"[DEBUG] Chart payload for '{chart_config['name']}':\n{json.dumps(payload, indent=2)}")
+        return self._put_chart(chart_id, chart_config["name"], payload, dataset_id)
+    
+    def _post_chart(self, chart_name, payload, dataset_id):
+        """POST a built chart payload"""
         resp = self.session.post(f"{self.superset_url}/api/v1/chart/", headers=self.headers, json=payload)
         if resp.status_code == 201:
             chart_id = resp.json()["id"]
-            print(f"✅ Created chart {chart_config['name']} (ID: {chart_id})")
+            self._record_new_chart(chart_id, chart_name, dataset_id)
+            print(f"✅ Created chart {chart_name} (ID: {chart_id})")
             return chart_id
         else:
-            print(f"❌ Failed to create chart {chart_config['name']}: {resp.status_code} - {resp.text}")
+            print(f"❌ Failed to create chart {chart_name}: {resp.status_code} - {resp.text}")
             return None
     
-    def update_chart(self, chart_id, chart_config, dataset_id, dataset_info):
-        """Update an existing chart"""
-        payload = self._build_chart_payload(chart_config, dataset_id, dataset_info)
-        print(f"[DEBUG] Chart payload for '{chart_config['name']}':\n{json.dumps(payload, indent=2)}")
+    def _forget_chart(self, chart_id, chart_name):
+        """Drop a chart that no longer exists from the in-memory index and the cached listing"""
+        if self._existing_charts is not None and self._existing_charts.get(chart_name, {}).get("id") == chart_id:
+            del self._existing_charts[chart_name]
+        if self.cache:
+            self.cache.invalidate(self.superset_url, "chart_index")
+    
+    def _put_chart(self, chart_id, chart_name, payload, dataset_id=None):
+        """PUT a built chart payload over an existing chart, creating it instead if it was deleted"""
         resp = self.session.put(f"{self.superset_url}/api/v1/chart/{chart_id}", headers=self.headers, json=payload)
         if resp.status_code == 200:
-            print(f"✅ Updated chart {chart_config['name']} (ID: {chart_id})")
+            print(f"✅ Updated chart {chart_name} (ID: {chart_id})")
             return chart_id
+        elif resp.status_code == 404:
+            print(f"⚠️ Chart {chart_name} (ID: {chart_id}) no longer exists, creating it")
+            self._forget_chart(chart_id, chart_name)
+            return self._post_chart(chart_name, payload, dataset_id)
         else:
-            print(f"❌ Failed to update chart {chart_config['name']}: {resp.status_code} - {resp.text}")
+            print(f"❌ Failed to update chart {chart_name}: {resp.status_code} - {resp.text}")
             return None
     
-    def get_existing_charts(self, dataset_id=None):
+    def iter_charts(self, columns=CHART_INDEX_COLUMNS, filters=None, max_workers=1):
+        """Stream charts from the paginated chart listing without holding the full list"""
+        return iter_resource(self.session, self.superset_url, self.headers, "chart",
+                             columns=columns, filters=filters, max_workers=max_workers)
+
+    def find_charts(self, **conditions):
+        """Server-side chart lookup by slice_name/viz_type/datasource_id - see superset_query.find_charts"""
+        return find_charts(self.session, self.superset_url, self.headers, **conditions)
+
+    def find_chart_id(self, chart_name):
+        """Return the ID of the chart with this exact name, or None"""
+        return find_chart_id(self.session, self.superset_url, self.headers, chart_name)
+
+    def _index_chart(self, index, chart):
+        """Add one listed chart to a name index"""
+        index[chart["slice_name"]] = {
+            "id": chart["id"],
+            "datasource_id": self._extract_dataset_id_from_chart(chart)
+        }
+
+    def _load_chart_index(self, max_workers=1):
+        """Build the name index from the chart listing, reusing the on-disk cache when unchanged.
+
+        The cached index is only reused after the one-row listing probe confirms it, even
+        within the TTL: charts created or deleted elsewhere would otherwise be missed.
+        """
+        signature = None
+        if self.cache:
+            cached = self.cache.get(self.superset_url, "chart_index", "all")
+            signature = fetch_listing_signature(self.session, self.superset_url, self.headers, "chart")
+            if cached and signature and cached["changed_on"] == signature:
+                print(f"📦 Chart list unchanged, using cached index ({len(cached['payload'])} charts)")
+                self.cache.touch(self.superset_url, "chart_index", "all")
+                return cached["payload"]
+        
+        index = {}
+        try:
+            for chart in self.iter_charts(max_workers=max_workers):
+                self._index_chart(index, chart)
+        except Exception as e:
+            print(f"❌ Failed to fetch existing charts: {e}")
+            return {}
+        
+        if self.cache and signature:
+            self.cache.put(self.superset_url, "chart_index", "all", index, changed_on=signature)
+        return index
+
+    def _record_new_chart(self, chart_id, chart_name, dataset_id):
+        """Keep the in-memory name index current and drop the now-stale cached listing"""
+        if self._existing_charts is not None:
+            self._index_chart(self._existing_charts, {"id": chart_id, "slice_name": chart_name, "datasource_id": dataset_id})
+        if self.cache:
+            self.cache.invalidate(self.superset_url, "chart_index")
+
+    def get_existing_charts(self, dataset_id=None, max_workers=1):
         """Get all existing charts, optionally filtered by dataset"""
         if self._existing_charts is None:
-            resp = self.session.get(f"{self.superset_url}/api/v1/chart/", headers=self.headers)
-            if resp.status_code == 200:
-                charts = resp.json()["result"]
-                self._existing_charts = {
-                    chart["slice_name"]: {
-                        "id": chart["id"],
-                        "datasource_id": self._extract_dataset_id_from_chart(chart)
-                    } for chart in charts
-                }
-            else:
-                print(f"❌ Failed to fetch existing charts: {resp.status_code}")
-                self._existing_charts = {}
+            self._existing_charts = self._load_chart_index(max_workers)
         
         if dataset_id:
             return {name: info for name, info in self._existing_charts.items() 
@@ -624,8 +647,55 @@ class SupersetChartCreator:
             print(f"➕ Creating new chart '{chart_name}'...")
             return self.create_chart(chart_config, dataset_id, dataset_info)
 
-    def create_multiple_charts(self, charts_config, dataset_id, update_mode=True):
-        """Create or update multiple charts from configuration list"""
+    def _provision_chart(self, chart_config, dataset_id, dataset_info, existing_charts, update_mode):
+        """Create or update one chart, returning (chart_id, error) for the worker pool"""
+        try:
+            if update_mode:
+                chart_id = self.create_or_update_chart(chart_config, dataset_id, dataset_info, existing_charts)
+            else:
+                chart_id = self.create_chart(chart_config, dataset_id, dataset_info)
+        except Exception as e:
+            return None, str(e)
+        if not chart_id:
+            return None, "request rejected by Superset"
+        return chart_id, None
+
+    def _map_concurrently(self, func, items, max_workers=1):
+        """Apply func to items, through a bounded thread pool when max_workers > 1, keeping order"""
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(func, items))
+        return [func(item) for item in items]
+
+    def _collect_chart_ids(self, charts_config, results):
+        """Return chart IDs in config order and report the charts that failed"""
+        processed_charts = []
+        failed_charts = []
+        for chart_config, (chart_id, error) in zip(charts_config, results):
+            if chart_id:
+                processed_charts.append(chart_id)
+            else:
+                failed_charts.append((chart_config["name"], error))
+        
+        if failed_charts:
+            print(f"⚠️ {len(failed_charts)} charts failed:")
+            for name, error in failed_charts:
+                print(f"   - '{name}': {error}")
+        
+        return processed_charts
+
+    def create_multiple_charts(self, charts_config, dataset_id, update_mode=True, max_workers=1, reconcile=False):
+        """Create or update multiple charts from configuration list
+
+        With max_workers > 1 the create/update calls are submitted through a bounded
+        worker pool; chart IDs are still returned in config order. With reconcile,
+        existing charts are only updated when their stored definition differs.
+        """
+        if update_mode and reconcile:
+            plan = self.plan_charts(charts_config, dataset_id, max_workers)
+            self.print_plan(plan)
+            return self.apply_plan(plan, dataset_id, max_workers)
+        
         dataset_info = self.auth.get_dataset_info(dataset_id)
         if not dataset_info:
             print("❌ No dataset info. Cannot create charts.")
@@ -634,24 +704,129 @@ class SupersetChartCreator:
         # Get existing charts for this dataset
         existing_charts = self.get_existing_charts(dataset_id) if update_mode else {}
         
-        processed_charts = []
-        for chart_config in charts_config:
-            if update_mode:
-                chart_id = self.create_or_update_chart(chart_config, dataset_id, dataset_info, existing_charts)
-            else:
-                chart_id = self.create_chart(chart_config, dataset_id, dataset_info)
+        def provision(chart_config):
+            return self._provision_chart(chart_config, dataset_id, dataset_info, existing_charts, update_mode)
+        
+        if max_workers > 1:
+            print(f"⚡ Provisioning {len(charts_config)} charts with up to {max_workers} in flight...")
+        results = self._map_concurrently(provision, charts_config, max_workers)
+        return self._collect_chart_ids(charts_config, results)
+
+    # === PLAN / APPLY (reconcile against what Superset already has) ===
+
+    def _diff_values(self, current, desired, path=""):
+        """List the paths where two JSON-like structures differ"""
+        if isinstance(current, dict) and isinstance(desired, dict):
+            changes = []
+            for key in sorted(set(current) | set(desired), key=str):
+                child = f"{path}.{key}" if path else str(key)
+                if key not in current:
+                    changes.append(f"+{child}")
+                elif key not in desired:
+                    changes.append(f"-{child}")
+                else:
+                    changes.extend(self._diff_values(current[key], desired[key], child))
+            return changes
+        if isinstance(current, list) and isinstance(desired, list) and len(current) == len(desired):
+            changes = []
+            for i, (a, b) in enumerate(zip(current, desired)):
+                changes.extend(self._diff_values(a, b, f"{path}[{i}]"))
+            return changes
+        return [] if current == desired else [path or "<root>"]
+
+    def _diff_chart(self, chart_info, payload):
+        """Structural diff between a stored chart and the payload we would send"""
+        changes = []
+        for key in ("slice_name", "viz_type"):
+            if chart_info.get(key) != payload[key]:
+                changes.append(key)
+        for key in ("params", "query_context"):
+            try:
+                current = json.loads(chart_info[key]) if chart_info.get(key) else None
+            except (TypeError, ValueError):
+                current = chart_info.get(key)
+            changes.extend(self._diff_values(current, json.loads(payload[key]), key))
+        return changes
+
+    def plan_charts(self, charts_config, dataset_id, max_workers=1):
+        """Work out which charts need a create, an update or nothing at all, from one listing pass"""
+        dataset_info = self.auth.get_dataset_info(dataset_id)
+        if not dataset_info:
+            print("❌ No dataset info. Cannot plan charts.")
+            return []
+        
+        # The dataset's charts with everything the diff needs, straight from the paginated listing
+        try:
+            existing_charts = {
+                chart["slice_name"]: chart
+                for chart in self.iter_charts(columns=CHART_PLAN_COLUMNS, max_workers=max_workers,
+                                              filters=make_filters(datasource_id=dataset_id))
+                if chart.get("datasource_id") == dataset_id
+            }
+        except Exception as e:
+            print(f"❌ Failed to fetch existing charts: {e}")
+            return []
+        
+        def plan(chart_config):
+            name = chart_config["name"]
+            payload = self._build_chart_payload(chart_config, dataset_id, dataset_info)
+            if name not in existing_charts:
+                return {"action": "create", "name": name, "chart_id": None, "payload": payload, "changes": []}
             
-            if chart_id:
-                processed_charts.append(chart_id)
+            chart_info = existing_charts[name]
+            changes = self._diff_chart(chart_info, payload)
+            action = "update" if changes else "noop"
+            return {"action": action, "name": name, "chart_id": chart_info["id"], "payload": payload, "changes": changes}
         
-        return processed_charts
+        return [plan(chart_config) for chart_config in charts_config]
 
-    def process_charts(self, charts_config, dataset_id, dashboard_title=None, update_mode=True):
+    def print_plan(self, plan):
+        """Print a dry-run report of a chart plan"""
+        counts = {"create": 0, "update": 0, "noop": 0}
+        print("\n📝 Chart plan:")
+        for entry in plan:
+            counts[entry["action"]] += 1
+            if entry["action"] == "create":
+                print(f"   ➕ create '{entry['name']}'")
+            elif entry["action"] == "update":
+                shown = ", ".join(entry["changes"][:5])
+                more = f" (+{len(entry['changes']) - 5} more)" if len(entry["changes"]) > 5 else ""
+                print(f"   🔄 update '{entry['name']}' (ID: {entry['chart_id']}): {shown}{more}")
+            else:
+                print(f"   ✔️ unchanged '{entry['name']}' (ID: {entry['chart_id']})")
+        print(f"📝 {counts['create']} to create, {counts['update']} to update, {counts['noop']} unchanged")
+
+    def apply_plan(self, plan, dataset_id, max_workers=1):
+        """Send only the creates and updates in a plan; return chart IDs in plan order"""
+        def apply(entry):
+            try:
+                if entry["action"] == "create":
+                    chart_id = self._post_chart(entry["name"], entry["payload"], dataset_id)
+                elif entry["action"] == "update":
+                    chart_id = self._put_chart(entry["chart_id"], entry["name"], entry["payload"], dataset_id)
+                else:
+                    chart_id = entry["chart_id"]
+            except Exception as e:
+                return None, str(e)
+            if not chart_id:
+                return None, "request rejected by Superset"
+            return chart_id, None
+        
+        results = self._map_concurrently(apply, plan, max_workers)
+        return self._collect_chart_ids(plan, results)
+
+    def process_charts(self, charts_config, dataset_id, dashboard_title=None, update_mode=True, max_workers=1,
+                       reconcile=False, dry_run=False, build_dashboard=False):
         """Main processing method - creates charts and optionally adds them to dashboard"""
         print(f"📊 Processing {len(charts_config)} charts...")
         
+        if dry_run:
+            self.print_plan(self.plan_charts(charts_config, dataset_id, max_workers))
+            print("ℹ️ Dry run - no changes sent")
+            return []
+        
         # Create/update charts
-        chart_ids = self.create_multiple_charts(charts_config, dataset_id, update_mode)
+        chart_ids = self.create_multiple_charts(charts_config, dataset_id, update_mode, max_workers, reconcile)
         
         if not chart_ids:
             print("❌ No charts were created successfully")
@@ -659,21 +834,58 @@ class SupersetChartCreator:
         
         print(f"✅ Successfully processed {len(chart_ids)} charts")
         
-        # # If dashboard title provided, create dashboard and add charts
-        # if dashboard_title:
-        #     print(f"\n🏗️ Creating/updating dashboard '{dashboard_title}'...")
-        #     dashboard_id = self.dashboard_manager.create_dashboard(dashboard_title)
+        # If dashboard title provided, create dashboard and place all charts in one layout update
+        if dashboard_title and build_dashboard:
+            print(f"\n🏗️ Creating/updating dashboard '{dashboard_title}'...")
+            dashboard_id = self.dashboard_manager.create_dashboard(dashboard_title)
             
-        #     if dashboard_id:
-        #         print(f"🔗 Adding charts to dashboard...")
-        #         self.dashboard_manager.add_charts_to_dashboard(dashboard_id, chart_ids)
-        #     else:
-        #         print("⚠️ Dashboard creation failed - charts created but not added to dashboard")
-        # else:
-        #     print("ℹ️ No dashboard specified - charts created without dashboard")
+            if dashboard_id:
+                print(f"🔗 Adding charts to dashboard...")
+                configs = {config["name"]: config for config in charts_config}
+                chart_info = {
+                    info["id"]: {
+                        "name": name,
+                        "viz_type": configs.get(name, {}).get("viz_type"),
+                        "tab": configs.get(name, {}).get("tab"),
+                    }
+                    for name, info in (self._existing_charts or {}).items()
+                }
+                self.dashboard_manager.build_dashboard(dashboard_id, chart_ids, chart_info)
+            else:
+                print("⚠️ Dashboard creation failed - charts created but not added to dashboard")
+        elif dashboard_title:
+            print("ℹ️ Dashboard assembly disabled - charts created without dashboard")
+        else:
+            print("ℹ️ No dashboard specified - charts created without dashboard")
         
         return chart_ids
 
+    def import_charts(self, charts_config, dataset_id, dashboard_title=None, passwords=None, dry_run=False):
+        """Provision all charts (and optionally a dashboard) with one import-bundle upload.
+
+        With dry_run the bundle is built (dataset export, UUID lookups, payloads) but not uploaded.
+        """
+        dataset_info = self.auth.get_dataset_info(dataset_id)
+        if not dataset_info:
+            print("❌ No dataset info. Cannot create charts.")
+            return False
+        
+        print(f"📦 Importing {len(charts_config)} charts as a bundle...")
+        payloads = [self._build_chart_payload(chart_config, dataset_id, dataset_info) for chart_config in charts_config]
+        bundle = self.bundle_importer.build_bundle(payloads, dataset_id, dashboard_title)
+        if bundle is None:
+            return False
+        if dry_run:
+            print("ℹ️ Dry run - bundle built, not uploaded")
+            return True
+        
+        success = self.bundle_importer.import_bundle(bundle, with_dashboard=bool(dashboard_title), passwords=passwords)
+        if success:
+            self._existing_charts = None
+            if self.cache:
+                self.cache.invalidate(self.superset_url, "chart_index")
+        return success
+
     # Delegate dashboard methods to dashboard_manager
     def get_existing_dashboards(self):
         """Get all existing dashboards - delegates to dashboard manager"""
@@ -691,6 +903,9 @@ class SupersetChartCreator:
         """Delete a chart by ID"""
         resp = self.session.delete(f"{self.superset_url}/api/v1/chart/{chart_id}", headers=self.headers)
         if resp.status_code == 200:
+            self._existing_charts = None
+            if self.cache:
+                self.cache.invalidate(self.superset_url, "chart_index")
             print(f"✅ Deleted chart ID: {chart_id}")
             return True
         else:
@@ -709,19 +924,12 @@ class SupersetChartCreator:
     def copy_working_chart(self, source_chart_name, new_chart_name):
         """Copy a working chart by name - integrated from successful copier"""
         # Find the source chart
-        resp = self.session.get(f"{self.superset_url}/api/v1/chart/", headers=self.headers)
-        if resp.status_code != 200:
-            print(f"❌ Failed to list charts: {resp.status_code}")
+        try:
+            source_chart_id = self.find_chart_id(source_chart_name)
+        except Exception as e:
+            print(f"❌ Failed to look up chart: {e}")
             return None
         
-        charts = resp.json()["result"]
-        # print(charts)
-        source_chart_id = None
-        for chart in charts:
-            if chart["slice_name"] == source_chart_name:
-                source_chart_id = chart["id"]
-                break
-        
         if not source_chart_id:
             print(f"❌ Chart '{source_chart_name}' not found")
             return None
@@ -777,12 +985,132 @@ class SupersetChartCreator:
         
         if resp.status_code == 201:
             new_chart_id = resp.json()["id"]
+            self._record_new_chart(new_chart_id, new_chart_name, dataset_id)
             print(f"✅ Successfully created chart '{new_chart_name}' (ID: {new_chart_id})")
             return new_chart_id
         else:
             print(f"❌ Failed to create chart: {resp.status_code} - {resp.text}")
             return None
 
+    # === ASYNC METHODS (require an AsyncSupersetAuth instance) ===
+
+    async def create_chart_async(self, chart_config, dataset_id, dataset_info):
+        """Async variant of create_chart"""
+        payload = self._build_chart_payload(chart_config, dataset_id, dataset_info)
+        status, data, text = await self.auth.request("POST", "/api/v1/chart/", json=payload)
+        if status == 201:
+            chart_id = data["id"]
+            self._record_new_chart(chart_id, chart_config["name"], dataset_id)
+            print(f"✅ Created chart {chart_config['name']} (ID: {chart_id})")
+            return chart_id
+        else:
+            print(f"❌ Failed to create chart {chart_config['name']}: {status} - {text}")
+            return None
+
+    async def update_chart_async(self, chart_id, chart_config, dataset_id, dataset_info):
+        """Async variant of update_chart"""
+        payload = self._build_chart_payload(chart_config, dataset_id, dataset_info)
+        status, _, text = await self.auth.request("PUT", f"/api/v1/chart/{chart_id}", json=payload)
+        if status == 200:
+            print(f"✅ Updated chart {chart_config['name']} (ID: {chart_id})")
+            return chart_id
+        elif status == 404:
+            print(f"⚠️ Chart {chart_config['name']} (ID: {chart_id}) no longer exists, creating it")
+            self._forget_chart(chart_id, chart_config["name"])
+            return await self.create_chart_async(chart_config, dataset_id, dataset_info)
+        else:
+            print(f"❌ Failed to update chart {chart_config['name']}: {status} - {text}")
+            return None
+
+    async def get_existing_charts_async(self, dataset_id=None, max_workers=1):
+        """Async variant of get_existing_charts"""
+        if self._existing_charts is None:
+            index = {}
+            try:
+                async for chart in iter_resource_async(self.auth, "chart", columns=CHART_INDEX_COLUMNS,
+                                                       max_workers=max_workers):
+                    self._index_chart(index, chart)
+            except Exception as e:
+                print(f"❌ Failed to fetch existing charts: {e}")
+                index = {}
+            self._existing_charts = index
+        
+        if dataset_id:
+            return {name: info for name, info in self._existing_charts.items()
+                   if info["datasource_id"] == dataset_id}
+        return self._existing_charts
+
+    async def create_or_update_chart_async(self, chart_config, dataset_id, dataset_info, existing_charts):
+        """Async variant of create_or_update_chart"""
+        chart_name = chart_config["name"]
+        
+        if chart_name in existing_charts:
+            chart_id = existing_charts[chart_name]["id"]
+            print(f"🔄 Chart '{chart_name}' exists, updating...")
+            return await self.update_chart_async(chart_id, chart_config, dataset_id, dataset_info)
+        else:
+            print(f"➕ Creating new chart '{chart_name}'...")
+            return await self.create_chart_async(chart_config, dataset_id, dataset_info)
+
+    async def create_multiple_charts_async(self, charts_config, dataset_id, update_mode=True, max_workers=8):
+        """Async variant of create_multiple_charts with at most max_workers requests in flight"""
+        dataset_info = await self.auth.get_dataset_info(dataset_id)
+        if not dataset_info:
+            print("❌ No dataset info. Cannot create charts.")
+            return []
+        
+        existing_charts = await self.get_existing_charts_async(dataset_id) if update_mode else {}
+        semaphore = asyncio.Semaphore(max_workers)
+        
+        async def provision(chart_config):
+            async with semaphore:
+                try:
+                    if update_mode:
+                        chart_id = await self.create_or_update_chart_async(chart_config, dataset_id, dataset_info, existing_charts)
+                    else:
+                        chart_id = await self.create_chart_async(chart_config, dataset_id, dataset_info)
+                except Exception as e:
+                    return None, str(e)
+            if not chart_id:
+                return None, "request rejected by Superset"
+            return chart_id, None
+        
+        results = await asyncio.gather(*(provision(chart_config) for chart_config in charts_config))
+        return self._collect_chart_ids(charts_config, results)
+
+    async def process_charts_async(self, charts_config, dataset_id, dashboard_title=None, update_mode=True, max_workers=8):
+        """Async variant of process_charts"""
+        print(f"📊 Processing {len(charts_config)} charts...")
+        
+        chart_ids = await self.create_multiple_charts_async(charts_config, dataset_id, update_mode, max_workers)
+        
+        if not chart_ids:
+            print("❌ No charts were created successfully")
+            return []
+        
+        print(f"✅ Successfully processed {len(chart_ids)} charts")
+        return chart_ids
+
+    async def delete_chart_async(self, chart_id):
+        """Async variant of delete_chart"""
+        status, _, text = await self.auth.request("DELETE", f"/api/v1/chart/{chart_id}")
+        if status == 200:
+            self._existing_charts = None
+            print(f"✅ Deleted chart ID: {chart_id}")
+            return True
+        else:
+            print(f"❌ Failed to delete chart {chart_id}: {status} - {text}")
+            return False
+
+    async def get_chart_info_async(self, chart_id):
+        """Async variant of get_chart_info"""
+        status, data, _ = await self.auth.request("GET", f"/api/v1/chart/{chart_id}")
+        if status == 200:
+            return data["result"]
+        else:
+            print(f"❌ Failed to get chart info for {chart_id}: {status}")
+            return None
+
     # === DEBUGGING METHODS ===
 
     def debug_chart_execution(self, chart_id):
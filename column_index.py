@@ -0,0 +1,98 @@
+import re
+
+TEMPORAL_TYPES = re.compile(r"DATE|TIME", re.IGNORECASE)
+NUMERIC_TYPES = re.compile(r"INT|DECIMAL|NUMERIC|FLOAT|DOUBLE|REAL|NUMBER|MONEY", re.IGNORECASE)
+BOOLEAN_TYPES = re.compile(r"BOOL", re.IGNORECASE)
+
+# Name hints used to rank columns of the same kind
+IDENTIFIER_NAME = re.compile(r"(^id$|_id$|^uuid$|_uuid$|_key$)", re.IGNORECASE)
+MEASURE_NAMES = ("score", "amount", "value", "price", "rate", "count", "number")
+
+# Estimated cardinality buckets (lower sorts first for categorical columns)
+LOW, MEDIUM, HIGH = 0, 1, 2
+
+
+class DatasetColumnIndex:
+    """Column profile of one dataset, built once from its metadata.
+
+    Columns are classified by their SQL type and Superset flags (is_dttm, groupby,
+    filterable) rather than by name, and the best temporal, categorical and numeric
+    columns are ranked up front so builders get them in O(1).
+    """
+
+    def __init__(self, column_details, main_dttm_col=None):
+        self.profiles = {}
+        for column in column_details:
+            profile = self._profile(column, main_dttm_col)
+            self.profiles[profile["name"]] = profile
+
+        self._ranked = {
+            kind: [p["name"] for p in sorted(
+                (p for p in self.profiles.values() if p["kind"] == kind),
+                key=self._rank_key(kind)
+            )]
+            for kind in ("temporal", "categorical", "numeric")
+        }
+
+    @classmethod
+    def from_dataset_info(cls, dataset_info):
+        """Build from SupersetAuth.get_dataset_info output (names only if details are missing)"""
+        details = dataset_info.get("column_details")
+        if details is None:
+            details = [{"column_name": name} for name in dataset_info["columns"]]
+        return cls(details, dataset_info.get("main_dttm_col"))
+
+    def _profile(self, column, main_dttm_col):
+        """Classify one column from its Superset metadata"""
+        name = column["column_name"]
+        sql_type = column.get("type") or ""
+        if column.get("is_dttm") or TEMPORAL_TYPES.search(sql_type):
+            kind = "temporal"
+        elif BOOLEAN_TYPES.search(sql_type):
+            kind = "categorical"
+        elif NUMERIC_TYPES.search(sql_type):
+            kind = "numeric"
+        elif sql_type:
+            kind = "categorical"
+        else:
+            kind = self._kind_from_name(name)
+
+        if BOOLEAN_TYPES.search(sql_type):
+            cardinality = LOW
+        elif IDENTIFIER_NAME.search(name):
+            cardinality = HIGH
+        else:
+            cardinality = MEDIUM
+
+        return {
+            "name": name,
+            "type": sql_type,
+            "kind": kind,
+            "is_main_dttm": name == main_dttm_col,
+            "groupby": column.get("groupby", True),
+            "filterable": column.get("filterable", True),
+            "cardinality": cardinality,
+            "identifier": bool(IDENTIFIER_NAME.search(name))
+        }
+
+    def _kind_from_name(self, name):
+        """Name-based fallback for columns without type metadata"""
+        lowered = name.lower()
+        if any(k in lowered for k in ("date", "time", "timestamp")):
+            return "temporal"
+        if any(k in lowered for k in MEASURE_NAMES):
+            return "numeric"
+        return "categorical"
+
+    def _rank_key(self, kind):
+        """Sort key putting the most suitable column of a kind first (ties keep dataset order)"""
+        if kind == "temporal":
+            return lambda p: (not p["is_main_dttm"], not p["filterable"])
+        if kind == "categorical":
+            return lambda p: (not p["groupby"], p["identifier"], p["cardinality"], not p["filterable"])
+        return lambda p: (p["identifier"], not any(k in p["name"].lower() for k in MEASURE_NAMES))
+
+    def best(self, kind):
+        """Best column of a kind ("temporal", "categorical" or "numeric"), or None"""
+        ranked = self._ranked.get(kind)
+        return ranked[0] if ranked else None
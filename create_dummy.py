@@ -1,195 +1,497 @@
+import argparse
+import io
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import os
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime
 
-# Set seed for reproducibility
-np.random.seed(42)
-random.seed(42)
+# === CONFIG ===
+START_DATE = "2024-07-01"
+END_DATE = "2024-12-31"
+SEED = 42  # same seed, range, series and block size -> same data
+BLOCK_ROWS = 500000  # rows generated and written at a time
+# Every random stream is seeded with [seed, stream tag, ...], so no two streams share a seed sequence
+DAILY_BLOCK_STREAM = 0
+RESPONSE_UNIT_STREAM = 1
+REGION_LEVEL_STREAM = 2
+SERIES_LEVEL_STREAM = 3
+OUTPUT_FILE = "enhanced_qualtrics_data.csv"
+# File extension per output format (the default output name follows --format)
+OUTPUT_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+LOAD_TEST_TABLE = "qualtrics_load_test"
 
-def generate_enhanced_qualtrics_data():
+# === SCALE-FACTOR MODE (one row per survey response) ===
+SF1_ROWS = 1000000  # responses at scale factor 1
+UNIT_ROWS = 65536  # rows per independently seeded unit; fixed so output does not depend on chunking
+RESPONSES_TABLE = "qualtrics_responses_load_test"
+OUTPUT_RESPONSES_FILE = "qualtrics_responses_sf{sf:g}"  # file name stem; the extension follows the format
+
+# Customer segments with their share of responses and satisfaction level
+SEGMENTS = ['Enterprise', 'SMB', 'Startup', 'Individual']
+SEGMENT_WEIGHTS = [0.3, 0.35, 0.25, 0.1]
+SEGMENT_LEVELS = [1.03, 1.0, 0.97, 0.95]
+
+# Dimension cardinality (multiplied by the scale factor when "scales") and Zipf skew (0 = uniform)
+SCALE_DIMENSIONS = {
+    "region": {"cardinality": 25, "skew": 1.1, "scales": False},
+    "survey": {"cardinality": 40, "skew": 1.2, "scales": True},
+    "respondent": {"cardinality": 250000, "skew": 0.8, "scales": True},
+}
+
+# Base metrics with realistic ranges
+BASE_NPS = 45
+BASE_CSAT = 75
+BASE_CES = 60
+BASE_RESPONSE_RATE = 78
+BASE_RESPONSES = 150
+
+# Seasonal effects by month: holiday season stress, summer vacation period
+SEASONAL_FACTORS = {11: 0.92, 12: 0.92, 7: 1.05, 8: 1.05}
+
+# Event windows repeated every year as ((month, day) start, (month, day) end, factor, description)
+EVENT_WINDOWS = [
+    ((8, 15), (8, 25), 1.12, "Product launch spike: Aug 15-25"),
+    ((9, 10), (9, 15), 0.75, "System outage dip: Sep 10-15"),
+    ((11, 25), (12, 5), 1.08, "Holiday promotion: Nov 25 - Dec 5"),
+    ((12, 20), (12, 30), 0.88, "Year-end challenges: Dec 20-30"),
+]
+
+# Load-test table: generator output with a series id, no uniqueness constraints
+create_load_test_table_query = f"""
+CREATE TABLE IF NOT EXISTS {LOAD_TEST_TABLE} (
+    series_id INTEGER,
+    date DATE NOT NULL,
+    nps_score INTEGER,
+    csat_score INTEGER,
+    ces_score INTEGER,
+    response_rate DECIMAL(5,2),
+    completion_rate DECIMAL(5,2),
+    responses_count INTEGER,
+    product_satisfaction DECIMAL(3,2),
+    support_satisfaction DECIMAL(3,2),
+    ease_of_use DECIMAL(3,2),
+    value_score DECIMAL(3,2),
+    day_of_week VARCHAR(10),
+    month VARCHAR(10),
+    week_number INTEGER,
+    is_weekend INTEGER,
+    quarter VARCHAR(2),
+    cx_composite_score DECIMAL(5,2)
+);
+"""
+
+create_responses_table_query = f"""
+CREATE TABLE IF NOT EXISTS {RESPONSES_TABLE} (
+    response_id BIGINT,
+    date DATE NOT NULL,
+    segment VARCHAR(20),
+    region VARCHAR(20),
+    survey_id INTEGER,
+    respondent_id BIGINT,
+    nps_rating SMALLINT,
+    csat_rating SMALLINT,
+    ces_rating SMALLINT,
+    product_satisfaction SMALLINT,
+    support_satisfaction SMALLINT,
+    ease_of_use SMALLINT,
+    value_score SMALLINT,
+    is_weekend SMALLINT
+);
+"""
+
+def calendar_factors(dates, start_date, end_date):
+    """Weekend, trend, seasonal and event factors for each date, as arrays"""
+    weekend = dates.weekday >= 5
+    weekend_factor = np.where(weekend, 0.95, 1.0)
+
+    # Monthly trend: 15% improvement from the first to the last month of the range
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    months_elapsed = (dates.year - start.year) * 12 + (dates.month - start.month)
+    month_span = max(1, (end.year - start.year) * 12 + (end.month - start.month))
+    trend_factor = 1 + (np.asarray(months_elapsed) / month_span) * 0.15
+
+    seasonal_factor = np.asarray(dates.month.map(lambda m: SEASONAL_FACTORS.get(m, 1.0)), dtype=float)
+
+    event_factor = np.ones(len(dates))
+    month_day = np.asarray(dates.month * 100 + dates.day)
+    for (start_month, start_day), (end_month, end_day), factor, _ in EVENT_WINDOWS:
+        in_window = (month_day >= start_month * 100 + start_day) & (month_day <= end_month * 100 + end_day)
+        event_factor = np.where(in_window & (event_factor == 1.0), factor, event_factor)
+
+    return weekend, weekend_factor * trend_factor * seasonal_factor * event_factor
+
+def generate_block(dates, series_ids, rng, start_date=START_DATE, end_date=END_DATE, series_levels=None):
+    """Generate one block: every date in `dates` for every series, date-major, fully vectorized"""
+    n_series = len(series_ids)
+    n = len(dates) * n_series
+    weekend, calendar_factor = calendar_factors(dates, start_date, end_date)
+
+    # Repeat per-date values for each series
+    weekend = np.repeat(weekend, n_series)
+    weekend_factor = np.where(weekend, 0.95, 1.0)
+    total_factor = np.repeat(calendar_factor, n_series) * rng.normal(1, 0.08, n)  # 8% daily variation
+    if series_levels is not None:
+        total_factor *= np.tile(series_levels, len(dates))
+
+    # Generate metrics with correlations
+    nps_score = np.clip(np.trunc(BASE_NPS * total_factor + rng.normal(0, 3, n)), 0, 100)
+
+    # CSAT correlates with NPS but has its own variation
+    csat_score = np.clip(np.trunc(
+        BASE_CSAT * total_factor + (nps_score - BASE_NPS) * 0.7 + rng.normal(0, 2, n)
+    ), 0, 100)
+
+    # CES (Customer Effort Score) - inverse relationship with satisfaction
+    ces_base_factor = np.where(nps_score > 50, 0.9, 1.1)
+    ces_score = np.clip(np.trunc(BASE_CES * ces_base_factor / total_factor + rng.normal(0, 2, n)), 1, 7)
+
+    # Response rate correlates with engagement, completion rate follows it
+    response_rate = np.clip(BASE_RESPONSE_RATE * total_factor * 1.02 + rng.normal(0, 1.5, n), 30, 95)
+    completion_rate = np.clip(response_rate * 0.95 + rng.normal(0, 2, n), 60, 98)
+
+    # Number of responses (varies by day and engagement)
+    responses_count = np.maximum(50, np.trunc(
+        BASE_RESPONSES * (response_rate / BASE_RESPONSE_RATE) * weekend_factor + rng.normal(0, 20, n)
+    ))
+
+    # Category scores (different aspects of service)
+    product_satisfaction = np.clip(3.5 + (nps_score - 45) * 0.02 + rng.normal(0, 0.3, n), 1, 5)
+    support_satisfaction = np.clip(3.3 + (csat_score - 75) * 0.02 + rng.normal(0, 0.4, n), 1, 5)
+    ease_of_use = np.clip(3.6 + (7 - ces_score) * 0.1 + rng.normal(0, 0.3, n), 1, 5)
+    value_score = np.clip(3.4 + (nps_score - 45) * 0.015 + rng.normal(0, 0.35, n), 1, 5)
+
+    cx_composite_score = nps_score * 0.3 + csat_score * 0.3 + (8 - ces_score) * 12.5 * 0.2 + response_rate * 0.2
+
+    # Calendar labels are computed once per date and repeated as categoricals
+    def per_date(labels):
+        labels = pd.Categorical(labels)
+        return pd.Categorical.from_codes(np.repeat(labels.codes, n_series), labels.categories)
+
+    columns = {}
+    if n_series > 1 or series_ids[0] != 0:
+        columns['series_id'] = np.tile(series_ids, len(dates))
+    columns.update({
+        'date': np.repeat(dates.values, n_series),
+        'nps_score': nps_score.astype(np.int16),
+        'csat_score': csat_score.astype(np.int16),
+        'ces_score': ces_score.astype(np.int8),
+        'response_rate': response_rate.round(1),
+        'completion_rate': completion_rate.round(1),
+        'responses_count': responses_count.astype(np.int32),
+        'product_satisfaction': product_satisfaction.round(2),
+        'support_satisfaction': support_satisfaction.round(2),
+        'ease_of_use': ease_of_use.round(2),
+        'value_score': value_score.round(2),
+        'day_of_week': per_date(dates.day_name()),
+        'month': per_date(dates.month_name()),
+        'week_number': np.repeat(np.asarray(dates.isocalendar().week, dtype=np.int8), n_series),
+        'is_weekend': weekend.astype(np.int8),
+        'quarter': per_date("Q" + dates.quarter.astype(str)),
+        'cx_composite_score': cx_composite_score.round(1)
+    })
+    return pd.DataFrame(columns)
+
+def iter_blocks(start_date=START_DATE, end_date=END_DATE, series=1, seed=SEED, block_rows=BLOCK_ROWS):
+    """Yield the dataset in blocks of about block_rows rows, each covering a date range for all series.
+
+    Every block draws from its own generator seeded with (seed, DAILY_BLOCK_STREAM, block index), so
+    blocks can be produced independently and the output only depends on the seed, range, series and
+    block_rows.
+    """
+    dates = pd.date_range(start_date, end_date, freq='D')
+    series_ids = np.arange(series)
+    # Per-series level so synthetic survey/brand series differ from each other
+    series_levels = None
+    if series > 1:
+        series_levels = np.random.default_rng([seed, SERIES_LEVEL_STREAM, series]).normal(1, 0.05, series)
+
+    days_per_block = max(1, block_rows // series)
+    for block_index, offset in enumerate(range(0, len(dates), days_per_block)):
+        rng = np.random.default_rng([seed, DAILY_BLOCK_STREAM, block_index])
+        yield generate_block(dates[offset:offset + days_per_block], series_ids, rng,
+                             start_date, end_date, series_levels)
+
+def generate_enhanced_qualtrics_data(start_date=START_DATE, end_date=END_DATE, series=1, seed=SEED):
     """Generate realistic Qualtrics data with meaningful patterns and fluctuations"""
-    
-    # Date range: 6 months of daily data
-    start_date = datetime(2024, 7, 1)
-    end_date = datetime(2024, 12, 31)
+    return pd.concat(iter_blocks(start_date, end_date, series, seed), ignore_index=True)
+
+def dimension_cardinalities(scale_factor, dimensions=SCALE_DIMENSIONS):
+    """Cardinality of each scale-factor dimension at this scale factor"""
+    return {
+        name: max(1, int(spec["cardinality"] * (scale_factor if spec["scales"] else 1)))
+        for name, spec in dimensions.items()
+    }
+
+def zipf_indices(u, cardinality, skew):
+    """Map uniform draws to 0..cardinality-1 with a bounded Zipf-like (power law) skew, in O(1) memory"""
+    if skew == 0:
+        k = u * cardinality
+    elif skew == 1:
+        k = np.exp(u * np.log(cardinality + 1)) - 1
+    else:
+        k = ((cardinality + 1) ** (1 - skew) - 1) * u + 1
+        k = k ** (1 / (1 - skew)) - 1
+    return np.minimum(k.astype(np.int64), cardinality - 1)
+
+def generate_response_unit(unit_index, scale_factor, start_date=START_DATE, end_date=END_DATE, seed=SEED,
+                           dimensions=SCALE_DIMENSIONS):
+    """Generate UNIT_ROWS response rows from the unit's own seed (rows unit_index * UNIT_ROWS onwards)"""
+    rng = np.random.default_rng([seed, RESPONSE_UNIT_STREAM, unit_index])
+    n = UNIT_ROWS
     dates = pd.date_range(start_date, end_date, freq='D')
-    
-    data = []
-    
-    for i, date in enumerate(dates):
-        # Base metrics with realistic ranges
-        base_nps = 45
-        base_csat = 75
-        base_ces = 60
-        base_response_rate = 78
-        
-        # Day of week effects (weekends typically lower engagement)
-        day_of_week = date.weekday()
-        weekend_factor = 0.95 if day_of_week >= 5 else 1.0
-        
-        # Monthly trends (improvement over time with some setbacks)
-        month_progress = (date.month - 7) / 5  # 0 to 1 over 6 months
-        trend_factor = 1 + (month_progress * 0.15)  # 15% improvement trend
-        
-        # Seasonal effects
-        if date.month in [11, 12]:  # Holiday season stress
-            seasonal_factor = 0.92
-        elif date.month in [7, 8]:  # Summer vacation period
-            seasonal_factor = 1.05
-        else:
-            seasonal_factor = 1.0
-        
-        # Event-based fluctuations (simulate product launches, issues, etc.)
-        event_factor = 1.0
-        
-        # Major product launch (positive impact)
-        if datetime(2024, 8, 15) <= date <= datetime(2024, 8, 25):
-            event_factor = 1.12
-        
-        # System outage period (negative impact)
-        elif datetime(2024, 9, 10) <= date <= datetime(2024, 9, 15):
-            event_factor = 0.75
-        
-        # Holiday promotion success
-        elif datetime(2024, 11, 25) <= date <= datetime(2024, 12, 5):
-            event_factor = 1.08
-        
-        # End of year issues
-        elif datetime(2024, 12, 20) <= date <= datetime(2024, 12, 30):
-            event_factor = 0.88
-        
-        # Random daily variation
-        daily_noise = np.random.normal(1, 0.08)  # 8% standard deviation
-        
-        # Calculate final factors
-        total_factor = weekend_factor * trend_factor * seasonal_factor * event_factor * daily_noise
-        
-        # Generate metrics with correlations
-        nps_score = max(0, min(100, int(base_nps * total_factor + np.random.normal(0, 3))))
-        
-        # CSAT correlates with NPS but has its own variation
-        csat_correlation = 0.7
-        csat_score = max(0, min(100, int(
-            base_csat * total_factor + 
-            (nps_score - base_nps) * csat_correlation + 
-            np.random.normal(0, 2)
-        )))
-        
-        # CES (Customer Effort Score) - inverse relationship with satisfaction
-        ces_base_factor = 0.9 if nps_score > 50 else 1.1
-        ces_score = max(1, min(7, int(
-            base_ces * ces_base_factor * (1/total_factor) + 
-            np.random.normal(0, 2)
-        )))
-        
-        # Response rate correlates with engagement
-        response_rate = max(30, min(95, 
-            base_response_rate * total_factor * 1.02 + np.random.normal(0, 1.5)
-        ))
-        
-        # Additional metrics for richer analysis
-        
-        # Survey completion rate (related to response rate)
-        completion_rate = max(60, min(98, 
-            response_rate * 0.95 + np.random.normal(0, 2)
-        ))
-        
-        # Number of responses (varies by day and engagement)
-        base_responses = 150
-        responses_count = max(50, int(
-            base_responses * (response_rate/78) * weekend_factor + 
-            np.random.normal(0, 20)
-        ))
-        
-        # Customer segment performance (simulate different customer types)
-        segments = ['Enterprise', 'SMB', 'Startup', 'Individual']
-        segment_weights = [0.3, 0.35, 0.25, 0.1]
-        
-        # Category scores (different aspects of service)
-        product_satisfaction = max(1, min(5, 
-            3.5 + (nps_score - 45) * 0.02 + np.random.normal(0, 0.3)
-        ))
-        
-        support_satisfaction = max(1, min(5, 
-            3.3 + (csat_score - 75) * 0.02 + np.random.normal(0, 0.4)
-        ))
-        
-        ease_of_use = max(1, min(5, 
-            3.6 + (7 - ces_score) * 0.1 + np.random.normal(0, 0.3)
-        ))
-        
-        # Value perception
-        value_score = max(1, min(5, 
-            3.4 + (nps_score - 45) * 0.015 + np.random.normal(0, 0.35)
-        ))
-        
-        data.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'nps_score': nps_score,
-            'csat_score': csat_score,
-            'ces_score': ces_score,
-            'response_rate': round(response_rate, 1),
-            'completion_rate': round(completion_rate, 1),
-            'responses_count': responses_count,
-            'product_satisfaction': round(product_satisfaction, 2),
-            'support_satisfaction': round(support_satisfaction, 2),
-            'ease_of_use': round(ease_of_use, 2),
-            'value_score': round(value_score, 2),
-            'day_of_week': date.strftime('%A'),
-            'month': date.strftime('%B'),
-            'week_number': date.isocalendar()[1],
-            'is_weekend': 1 if day_of_week >= 5 else 0,
-            'quarter': f"Q{(date.month-1)//3 + 1}",
-            # Calculated fields for analysis
-            'cx_composite_score': round(
-                (nps_score * 0.3 + csat_score * 0.3 + (8-ces_score) * 12.5 * 0.2 + response_rate * 0.2), 1
-            )
-        })
-    
-    return pd.DataFrame(data)
-
-# Generate the enhanced dataset
-df = generate_enhanced_qualtrics_data()
-
-# Display summary statistics
-print("📊 Enhanced Qualtrics Dataset Summary")
-print("="*50)
-print(f"Date Range: {df['date'].min()} to {df['date'].max()}")
-print(f"Total Records: {len(df)}")
-print(f"Columns: {len(df.columns)}")
-
-print("\n📈 Key Metrics Overview:")
-metrics = ['nps_score', 'csat_score', 'ces_score', 'response_rate', 'cx_composite_score']
-for metric in metrics:
-    print(f"{metric.upper()}: "
-          f"Min={df[metric].min():.1f}, "
-          f"Max={df[metric].max():.1f}, "
-          f"Avg={df[metric].mean():.1f}, "
-          f"Std={df[metric].std():.1f}")
-
-print("\n🎯 Notable Patterns Built In:")
-print("- Weekend effect: Lower engagement on weekends")
-print("- Seasonal trends: Summer boost, holiday stress")
-print("- Product launch spike: Aug 15-25")
-print("- System outage dip: Sep 10-15") 
-print("- Holiday promotion: Nov 25 - Dec 5")
-print("- Year-end challenges: Dec 20-30")
-print("- Overall improvement trend over 6 months")
-print("- Realistic correlations between metrics")
-
-# Save to CSV
-output_filename = 'enhanced_qualtrics_data.csv'
-df.to_csv(output_filename, index=False)
-print(f"\n💾 Data saved to: {output_filename}")
-
-# Show sample data
-print(f"\n📋 Sample Data (First 5 rows):")
-print(df.head().to_string(index=False))
-
-print(f"\n📊 Weekend vs Weekday Comparison:")
-weekend_avg = df[df['is_weekend'] == 1]['cx_composite_score'].mean()
-weekday_avg = df[df['is_weekend'] == 0]['cx_composite_score'].mean()
-print(f"Weekend Average CX Score: {weekend_avg:.1f}")
-print(f"Weekday Average CX Score: {weekday_avg:.1f}")
-print(f"Weekend Impact: {((weekend_avg/weekday_avg - 1) * 100):+.1f}%")
\ No newline at end of file
+    weekend, calendar_factor = calendar_factors(dates, start_date, end_date)
+
+    # Fewer responses arrive on weekends
+    day_cdf = np.cumsum(np.where(weekend, 0.6, 1.0))
+    day = np.searchsorted(day_cdf, rng.random(n) * day_cdf[-1], side='right')
+
+    cardinalities = dimension_cardinalities(scale_factor, dimensions)
+    region_levels = np.random.default_rng([seed, REGION_LEVEL_STREAM]).normal(1, 0.04, cardinalities["region"])
+    segment = rng.choice(len(SEGMENTS), n, p=SEGMENT_WEIGHTS)
+    region = zipf_indices(rng.random(n), cardinalities["region"], dimensions["region"]["skew"])
+    survey = zipf_indices(rng.random(n), cardinalities["survey"], dimensions["survey"]["skew"])
+    respondent = zipf_indices(rng.random(n), cardinalities["respondent"], dimensions["respondent"]["skew"])
+
+    total_factor = (calendar_factor[day] * np.asarray(SEGMENT_LEVELS)[segment] * region_levels[region]
+                    * rng.normal(1, 0.08, n))
+
+    # Response-level ratings with the same correlations as the daily metrics
+    nps_rating = np.clip(np.rint(rng.normal(7.0 * total_factor, 2.0)), 0, 10)
+    csat_rating = np.clip(np.rint(rng.normal(3.8 * total_factor + (nps_rating - 7) * 0.15, 0.7)), 1, 5)
+    ces_rating = np.clip(np.rint(rng.normal(3.5 / total_factor, 1.2)), 1, 7)
+
+    def category_score(base):
+        return np.clip(np.rint(rng.normal(base, 0.8)), 1, 5).astype(np.int8)
+
+    region_labels = pd.Index([f"Region {i + 1:02d}" for i in range(cardinalities["region"])])
+    return pd.DataFrame({
+        'response_id': np.arange(unit_index * n, (unit_index + 1) * n, dtype=np.int64),
+        'date': dates.values[day],
+        'segment': pd.Categorical.from_codes(segment, SEGMENTS),
+        'region': pd.Categorical.from_codes(region, region_labels),
+        'survey_id': (survey + 1).astype(np.int32),
+        'respondent_id': respondent + 1,
+        'nps_rating': nps_rating.astype(np.int8),
+        'csat_rating': csat_rating.astype(np.int8),
+        'ces_rating': ces_rating.astype(np.int8),
+        'product_satisfaction': category_score(csat_rating + (nps_rating - 7) * 0.1),
+        'support_satisfaction': category_score(csat_rating),
+        'ease_of_use': category_score(6 - ces_rating * 0.5),
+        'value_score': category_score(csat_rating - 0.2),
+        'is_weekend': weekend[day].astype(np.int8)
+    })
+
+def generate_responses(start_row, stop_row, scale_factor, start_date=START_DATE, end_date=END_DATE, seed=SEED):
+    """Response rows [start_row, stop_row), identical however the row range is split"""
+    first_unit, last_unit = start_row // UNIT_ROWS, (stop_row - 1) // UNIT_ROWS
+    units = [generate_response_unit(unit, scale_factor, start_date, end_date, seed)
+             for unit in range(first_unit, last_unit + 1)]
+    block = pd.concat(units, ignore_index=True) if len(units) > 1 else units[0]
+    offset = start_row - first_unit * UNIT_ROWS
+    return block.iloc[offset:offset + (stop_row - start_row)].reset_index(drop=True)
+
+def iter_response_blocks(scale_factor, start_date=START_DATE, end_date=END_DATE, seed=SEED,
+                         block_rows=BLOCK_ROWS, workers=1):
+    """Yield SF1_ROWS * scale_factor response rows in order, generating blocks in up to `workers` processes"""
+    total_rows = int(SF1_ROWS * scale_factor)
+    ranges = [(start, min(start + block_rows, total_rows)) for start in range(0, total_rows, block_rows)]
+    if workers <= 1:
+        for start, stop in ranges:
+            yield generate_responses(start, stop, scale_factor, start_date, end_date, seed)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for start, stop in ranges:
+            pending.append(executor.submit(generate_responses, start, stop, scale_factor, start_date, end_date, seed))
+            # Keep a bounded window of blocks in flight so memory does not grow with the scale factor
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def write_csv(blocks, path=OUTPUT_FILE):
+    """Append blocks to a CSV file, writing the header once; returns the row count"""
+    total = 0
+    for i, block in enumerate(blocks):
+        block.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False, date_format='%Y-%m-%d')
+        total += len(block)
+        print(f"  💾 Block {i + 1}: {total} rows written")
+    return total
+
+def write_parquet(blocks, path):
+    """Write blocks as row groups of one Parquet file; returns the row count"""
+    total = 0
+    writer = None
+    try:
+        for i, block in enumerate(blocks):
+            table = pa.Table.from_pandas(block, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            total += len(block)
+            print(f"  💾 Block {i + 1}: {total} rows written")
+    finally:
+        if writer is not None:
+            writer.close()
+    return total
+
+def write_arrow(blocks, path):
+    """Write blocks as record batches of one Arrow IPC file (memory-mappable on read); returns the row count"""
+    total = 0
+    writer = None
+    try:
+        for i, block in enumerate(blocks):
+            table = pa.Table.from_pandas(block, preserve_index=False)
+            if writer is None:
+                # IPC files allow one dictionary per field, and categories differ between blocks
+                schema = pa.schema([
+                    field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field
+                    for field in table.schema
+                ])
+                writer = pa.ipc.new_file(path, schema)
+            writer.write_table(table.cast(schema))
+            total += len(block)
+            print(f"  💾 Block {i + 1}: {total} rows written")
+    finally:
+        if writer is not None:
+            writer.close()
+    return total
+
+def write_blocks(blocks, output_format, path):
+    """Write blocks to a csv, parquet or arrow file; returns the row count"""
+    if output_format == "parquet":
+        return write_parquet(blocks, path)
+    if output_format == "arrow":
+        return write_arrow(blocks, path)
+    return write_csv(blocks, path)
+
+def output_path(output, output_format, stem=os.path.splitext(OUTPUT_FILE)[0]):
+    """Output file name, defaulting to `stem` plus the extension of the format"""
+    return output or stem + OUTPUT_EXTENSIONS[output_format]
+
+def write_db(blocks, table=LOAD_TEST_TABLE, create_query=create_load_test_table_query):
+    """COPY blocks into a load-test table, one transaction per block; returns the row count"""
+    from load_qualtrics_data import open_database
+
+    def copy_block(cur, block):
+        buffer = io.StringIO()
+        block.to_csv(buffer, index=False, header=False, date_format='%Y-%m-%d')
+        buffer.seek(0)
+        cur.copy_expert(f"COPY {table} ({', '.join(block.columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        return len(block)
+
+    db = open_database()
+    total = 0
+    try:
+        db.run(lambda cur: cur.execute(create_query))
+        for i, block in enumerate(blocks):
+            if table == LOAD_TEST_TABLE and 'series_id' not in block.columns:
+                block = block.assign(series_id=0)
+            total += db.run(lambda cur: copy_block(cur, block))
+            print(f"  💾 Block {i + 1}: {total} rows copied into {table}")
+    finally:
+        db.close()
+    return total
+
+def print_summary(df):
+    """Display summary statistics for a generated block"""
+    print("📊 Enhanced Qualtrics Dataset Summary")
+    print("="*50)
+    print(f"Date Range: {df['date'].min():%Y-%m-%d} to {df['date'].max():%Y-%m-%d}")
+    print(f"Total Records: {len(df)}")
+    print(f"Columns: {len(df.columns)}")
+
+    print("\n📈 Key Metrics Overview:")
+    metrics = ['nps_score', 'csat_score', 'ces_score', 'response_rate', 'cx_composite_score']
+    for metric in metrics:
+        print(f"{metric.upper()}: "
+              f"Min={df[metric].min():.1f}, "
+              f"Max={df[metric].max():.1f}, "
+              f"Avg={df[metric].mean():.1f}, "
+              f"Std={df[metric].std():.1f}")
+
+    print("\n🎯 Notable Patterns Built In:")
+    print("- Weekend effect: Lower engagement on weekends")
+    print("- Seasonal trends: Summer boost, holiday stress")
+    for *_, description in EVENT_WINDOWS:
+        print(f"- {description}")
+    print("- Overall improvement trend over the date range")
+    print("- Realistic correlations between metrics")
+
+    print(f"\n📋 Sample Data (First 5 rows):")
+    print(df.head().to_string(index=False))
+
+    print(f"\n📊 Weekend vs Weekday Comparison:")
+    weekend_avg = df[df['is_weekend'] == 1]['cx_composite_score'].mean()
+    weekday_avg = df[df['is_weekend'] == 0]['cx_composite_score'].mean()
+    print(f"Weekend Average CX Score: {weekend_avg:.1f}")
+    print(f"Weekday Average CX Score: {weekday_avg:.1f}")
+    print(f"Weekend Impact: {((weekend_avg/weekday_avg - 1) * 100):+.1f}%")
+
+def main(start_date=START_DATE, end_date=END_DATE, series=1, seed=SEED, block_rows=BLOCK_ROWS,
+         output_format="csv", output=None):
+    """Generate the dataset block by block and stream it to CSV, Parquet, Arrow or the load-test table"""
+    started = datetime.now()
+    summarized = False
+
+    def blocks():
+        nonlocal summarized
+        for block in iter_blocks(start_date, end_date, series, seed, block_rows):
+            if not summarized:
+                print_summary(block)
+                print(f"\n💾 Writing {output_format} output...")
+                summarized = True
+            yield block
+
+    if output_format == "db":
+        total = write_db(blocks())
+        output = LOAD_TEST_TABLE
+    else:
+        output = output_path(output, output_format)
+        total = write_blocks(blocks(), output_format, output)
+
+    elapsed = (datetime.now() - started).total_seconds()
+    print(f"\n💾 {total} rows saved to: {output} in {elapsed:.1f}s")
+
+def main_scale_factor(scale_factor, start_date=START_DATE, end_date=END_DATE, seed=SEED, block_rows=BLOCK_ROWS,
+                      workers=1, output_format="parquet", output=None):
+    """Generate the response-level load-test dataset for a scale factor and stream it to a sink"""
+    started = datetime.now()
+    cardinalities = dimension_cardinalities(scale_factor)
+    print(f"📊 Scale factor {scale_factor}: {int(SF1_ROWS * scale_factor)} responses, {start_date} to {end_date}")
+    print(f"   Segments: {len(SEGMENTS)}, " + ", ".join(f"{name}s: {count}" for name, count in cardinalities.items()))
+
+    blocks = iter_response_blocks(scale_factor, start_date, end_date, seed, block_rows, workers)
+    if output_format == "db":
+        total = write_db(blocks, RESPONSES_TABLE, create_responses_table_query)
+        output = RESPONSES_TABLE
+    else:
+        output = output_path(output, output_format, OUTPUT_RESPONSES_FILE.format(sf=scale_factor))
+        total = write_blocks(blocks, output_format, output)
+
+    elapsed = (datetime.now() - started).total_seconds()
+    print(f"\n💾 {total} rows saved to: {output} in {elapsed:.1f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic Qualtrics data")
+    parser.add_argument("--start", default=START_DATE, help="first date (YYYY-MM-DD)")
+    parser.add_argument("--end", default=END_DATE, help="last date (YYYY-MM-DD)")
+    parser.add_argument("--series", type=int, default=1, help="number of synthetic survey/brand series")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--block-rows", type=int, default=BLOCK_ROWS, help="rows generated and written at a time")
+    parser.add_argument("--scale-factor", type=float, help=f"response-level load-test data, {SF1_ROWS} rows per unit")
+    parser.add_argument("--workers", type=int, default=1, help="processes generating scale-factor blocks")
+    parser.add_argument("--format", choices=["csv", "parquet", "arrow", "db"], help="default: csv, parquet with --scale-factor")
+    parser.add_argument("--output", help="output file for csv/parquet/arrow (default name follows the format)")
+    args = parser.parse_args()
+
+    if args.scale_factor:
+        main_scale_factor(args.scale_factor, args.start, args.end, args.seed, args.block_rows, args.workers,
+                          args.format or "parquet", args.output)
+    else:
+        main(args.start, args.end, args.series, args.seed, args.block_rows, args.format or "csv", args.output)
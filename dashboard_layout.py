@@ -0,0 +1,258 @@
+import uuid
+
+GRID_COLUMNS = 12
+DEFAULT_WIDTH = 4
+DEFAULT_HEIGHT = 50
+
+# Dashboards with more charts than this are split into tabs; Superset only renders the active tab
+CHARTS_PER_TAB = 24
+
+# Grid columns (out of 12) and height per viz_type: KPIs are narrow, time series half width,
+# tables full width
+VIZ_WIDTHS = {
+    "big_number_total": 3,
+    "big_number": 4,
+    "pie": 4,
+    "echarts_timeseries": 6,
+    "echarts_timeseries_line": 6,
+    "echarts_timeseries_bar": 6,
+    "echarts_area": 6,
+    "line": 6,
+    "bar": 6,
+    "dist_bar": 6,
+    "bubble": 6,
+    "bubble_v2": 6,
+    "table": 12,
+    "pivot_table_v2": 12,
+}
+VIZ_HEIGHTS = {
+    "big_number_total": 30,
+    "big_number": 40,
+    "table": 70,
+    "pivot_table_v2": 70,
+}
+
+# Namespace for layout node IDs, so rebuilding the same layout gives the same IDs
+LAYOUT_NAMESPACE = uuid.UUID("0d3f7c52-3c1e-4b8e-9a8e-5f2d4c6b9e21")
+
+
+def _node_id(prefix, seed):
+    """Stable, unique-enough node ID such as ROW-1a2b3c4d5e"""
+    return f"{prefix}-{uuid.uuid5(LAYOUT_NAMESPACE, seed).hex[:10]}"
+
+
+def _free_id(position, prefix, seed):
+    """_node_id that is not taken yet in position (a row can outlive the chart its ID came from)"""
+    node_id, n = _node_id(prefix, seed), 0
+    while node_id in position:
+        n += 1
+        node_id = _node_id(prefix, f"{seed}:{n}")
+    return node_id
+
+
+def _chart_key(chart):
+    """Node ID of a chart: CHART-<id> for saved charts, CHART-<uuid> for import bundles"""
+    return f"CHART-{chart['id'] if chart.get('id') is not None else chart['uuid']}"
+
+
+def chart_size(chart):
+    """(width, height) for a chart, from explicit width/height or its viz_type"""
+    viz_type = chart.get("viz_type")
+    width = chart.get("width") or VIZ_WIDTHS.get(viz_type, DEFAULT_WIDTH)
+    height = chart.get("height") or VIZ_HEIGHTS.get(viz_type, DEFAULT_HEIGHT)
+    return min(width, GRID_COLUMNS), height
+
+
+def pack_rows(charts):
+    """Greedily pack charts, in order, into rows whose widths sum to at most 12 columns"""
+    rows, row, used = [], [], 0
+    for chart in charts:
+        width, _ = chart_size(chart)
+        if row and used + width > GRID_COLUMNS:
+            rows.append(row)
+            row, used = [], 0
+        row.append(chart)
+        used += width
+    if row:
+        rows.append(row)
+    return rows
+
+
+def _group_tabs(charts, charts_per_tab):
+    """[(tab title, charts)] from each chart's "tab", or fixed-size pages; [] when no tabs are needed"""
+    if any(chart.get("tab") for chart in charts):
+        tabs = {}
+        for chart in charts:
+            tabs.setdefault(chart.get("tab") or "Other", []).append(chart)
+        return list(tabs.items())
+    if charts_per_tab and len(charts) > charts_per_tab:
+        return [
+            (f"Charts {start + 1}-{min(start + charts_per_tab, len(charts))}", charts[start:start + charts_per_tab])
+            for start in range(0, len(charts), charts_per_tab)
+        ]
+    return []
+
+
+def _add_rows(position, parent_id, parents, charts):
+    """Append packed ROW -> CHART nodes for charts under parent_id"""
+    for row in pack_rows(charts):
+        row_id = _free_id(position, "ROW", f"row:{_chart_key(row[0])}")
+        position[parent_id]["children"].append(row_id)
+        position[row_id] = {
+            "type": "ROW", "id": row_id, "children": [],
+            "parents": parents + [parent_id],
+            "meta": {"background": "BACKGROUND_TRANSPARENT"}
+        }
+        for chart in row:
+            chart_key = _chart_key(chart)
+            width, height = chart_size(chart)
+            meta = {"width": width, "height": height, "sliceName": chart.get("name") or chart_key}
+            if chart.get("id") is not None:
+                meta["chartId"] = chart["id"]
+            if chart.get("uuid"):
+                meta["uuid"] = chart["uuid"]
+            position[row_id]["children"].append(chart_key)
+            position[chart_key] = {
+                "type": "CHART", "id": chart_key, "children": [],
+                "parents": parents + [parent_id, row_id],
+                "meta": meta
+            }
+
+
+def _add_tabs(position, tabs_id, tabs):
+    """Append TAB nodes (with their rows) to an existing TABS node, reusing tabs with the same title"""
+    parents = position[tabs_id]["parents"] + [tabs_id]
+    existing = {position[tab_id]["meta"].get("text"): tab_id for tab_id in position[tabs_id]["children"]}
+    for title, charts in tabs:
+        if title in existing:
+            _add_rows(position, existing[title], parents, charts)
+            continue
+        tab_id = _free_id(position, "TAB", f"tab:{title}:{_chart_key(charts[0])}")
+        position[tabs_id]["children"].append(tab_id)
+        position[tab_id] = {
+            "type": "TAB", "id": tab_id, "children": [], "parents": parents,
+            "meta": {"text": title, "defaultText": "Tab title", "placeholder": "Tab title"}
+        }
+        _add_rows(position, tab_id, parents, charts)
+
+
+def build_layout(charts, charts_per_tab=CHARTS_PER_TAB):
+    """Build a complete position_json tree ROOT -> GRID -> [TABS -> TAB ->] ROW -> CHART.
+
+    charts are dicts with "id" (saved charts) or "uuid" (import bundles), and optionally
+    "name", "viz_type", "tab", "width" and "height".
+    """
+    position = {
+        "DASHBOARD_VERSION_KEY": "v2",
+        "ROOT_ID": {"type": "ROOT", "id": "ROOT_ID", "children": ["GRID_ID"]},
+        "GRID_ID": {"type": "GRID", "id": "GRID_ID", "children": [], "parents": ["ROOT_ID"]}
+    }
+    tabs = _group_tabs(charts, charts_per_tab)
+    if tabs:
+        tabs_id = _node_id("TABS", "tabs:GRID_ID")
+        position["GRID_ID"]["children"].append(tabs_id)
+        position[tabs_id] = {"type": "TABS", "id": tabs_id, "children": [], "parents": ["ROOT_ID", "GRID_ID"]}
+        _add_tabs(position, tabs_id, tabs)
+    else:
+        _add_rows(position, "GRID_ID", ["ROOT_ID"], charts)
+    return position
+
+
+def layout_charts(position):
+    """Charts already placed in a position_json, as chart dicts in layout order"""
+    return [
+        {
+            "id": node["meta"].get("chartId"),
+            "uuid": node["meta"].get("uuid"),
+            "name": node["meta"].get("sliceName"),
+            "width": node["meta"].get("width"),
+            "height": node["meta"].get("height"),
+        }
+        for node in position.values()
+        if isinstance(node, dict) and node.get("type") == "CHART" and isinstance(node.get("meta"), dict)
+    ]
+
+
+def _reparent(position, node_id, parents):
+    """Set the parents of a node and its whole subtree after it was moved"""
+    node = position[node_id]
+    node["parents"] = parents
+    for child in node.get("children", []):
+        _reparent(position, child, parents + [node_id])
+
+
+def _tab_grid(position, first_tab_title="Overview"):
+    """Move the grid's current content into the first tab of a new TABS node and return its ID"""
+    grid = position["GRID_ID"]
+    tabs_id = _node_id("TABS", "tabs:GRID_ID")
+    position[tabs_id] = {"type": "TABS", "id": tabs_id, "children": [], "parents": ["ROOT_ID", "GRID_ID"]}
+    if grid["children"]:
+        tab_id = _node_id("TAB", f"tab:{first_tab_title}:GRID_ID")
+        position[tab_id] = {
+            "type": "TAB", "id": tab_id, "children": grid["children"], "parents": ["ROOT_ID", "GRID_ID", tabs_id],
+            "meta": {"text": first_tab_title, "defaultText": "Tab title", "placeholder": "Tab title"}
+        }
+        position[tabs_id]["children"].append(tab_id)
+        for child in grid["children"]:
+            _reparent(position, child, ["ROOT_ID", "GRID_ID", tabs_id, tab_id])
+    grid["children"] = [tabs_id]
+    return tabs_id
+
+
+def extend_layout(position, charts, charts_per_tab=CHARTS_PER_TAB):
+    """Add charts to an existing position_json, keeping the current arrangement.
+
+    A layout without a ROOT/GRID tree (e.g. flat CHART nodes) is rebuilt around the charts
+    it already holds. New charts get new rows, in the last tab when the grid is tabbed, or their
+    own tabs when they name one or are too many for a single tab; an untabbed grid is then
+    turned into tabs, its current content becoming the first tab.
+    """
+    if not charts:
+        return position
+    grid = position.get("GRID_ID")
+    if not grid or "ROOT_ID" not in position:
+        return build_layout(layout_charts(position) + list(charts), charts_per_tab)
+
+    tabs_id = next((child for child in grid["children"] if position.get(child, {}).get("type") == "TABS"), None)
+    tabs = _group_tabs(charts, charts_per_tab)
+    if tabs and not tabs_id:
+        tabs_id = _tab_grid(position)
+    if tabs_id and tabs:
+        _add_tabs(position, tabs_id, tabs)
+    elif tabs_id and position[tabs_id]["children"]:
+        last_tab = position[tabs_id]["children"][-1]
+        _add_rows(position, last_tab, position[last_tab]["parents"], charts)
+    elif tabs_id:
+        _add_tabs(position, tabs_id, [("Charts", list(charts))])
+    else:
+        _add_rows(position, "GRID_ID", ["ROOT_ID"], charts)
+    return position
+
+
+# Layout containers that are dropped once they hold nothing
+CONTAINER_TYPES = {"ROW", "COLUMN", "TAB", "TABS"}
+
+
+def remove_charts(position, chart_ids):
+    """Remove the charts with these IDs from a position_json.
+
+    Their IDs are also removed from every parent's children, and rows, columns and tabs
+    left empty are dropped, so no node points at a missing one.
+    """
+    chart_ids = set(chart_ids)
+    removed = {
+        key for key, node in position.items()
+        if isinstance(node, dict) and node.get("type", "CHART") == "CHART"
+        and isinstance(node.get("meta"), dict) and node["meta"].get("chartId") in chart_ids
+    }
+    while removed:
+        for key in removed:
+            del position[key]
+        for node in position.values():
+            if isinstance(node, dict) and isinstance(node.get("children"), list):
+                node["children"] = [child for child in node["children"] if child not in removed]
+        removed = {
+            key for key, node in position.items()
+            if isinstance(node, dict) and node.get("type") in CONTAINER_TYPES and not node.get("children")
+        }
+    return position
@@ -1,6 +1,8 @@
 import json
 from auth import SupersetAuth
 from dashboard_manager import SupersetDashboardManager
+from session_store import SessionStore
+from superset_query import find_chart_id
 
 class WorkingChartCopier:
     def __init__(self, auth_instance):
@@ -11,12 +13,13 @@ class WorkingChartCopier:
 
     def find_chart_by_name(self, chart_name):
         """Find chart ID by name"""
-        resp = self.session.get(f"{self.superset_url}/api/v1/chart/", headers=self.headers)
-        if resp.status_code == 200:
-            charts = resp.json()["result"]
-            for chart in charts:
-                if chart["slice_name"] == chart_name:
-                    return chart["id"]
+        try:
+            chart_id = find_chart_id(self.session, self.superset_url, self.headers, chart_name)
+        except Exception as e:
+            print(f"❌ Failed to look up chart: {e}")
+            return None
+        if chart_id:
+            return chart_id
         print(f"❌ Chart '{chart_name}' not found")
         return None
 
@@ -302,7 +305,7 @@ class WorkingChartCopier:
 # USAGE SCRIPT
 if __name__ == "__main__":
     # Initialize
-    auth = SupersetAuth("http://localhost:8088", "admin", "admin")
+    auth = SupersetAuth("http://localhost:8088", "admin", "admin", session_store=SessionStore())
     auth.authenticate()
     
     copier = WorkingChartCopier(auth)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Apply the same chart/dashboard definitions to every Superset environment in SUPERSET_ENVIRONMENTS.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from auth import SupersetAuth
+from chart_creator import SupersetChartCreator
+from metadata_cache import MetadataCache
+from request_scheduler import RequestScheduler
+from session_store import SessionStore
+from chart_configs import (
+    SUPERSET_ENVIRONMENTS,
+    FANOUT_MAX_TARGETS,
+    CACHE_CONFIG,
+    SCHEDULER_CONFIG,
+    SESSION_STORE_PATH,
+    DATASET_ID,
+    DASHBOARD_TITLE,
+    MAX_WORKERS,
+    RECONCILE_MODE,
+    AUTO_UPDATE_DASHBOARD,
+    CHARTS_CONFIG,
+    validate_all_configs
+)
+
+
+def target_cache_path(name):
+    """Per-environment cache file, e.g. .superset_cache.acme-prod.sqlite"""
+    root, ext = os.path.splitext(CACHE_CONFIG["path"])
+    return f"{root}.{name}{ext}"
+
+
+def provision_target(target, charts_config, session_store, mode="process", dry_run=False):
+    """Provision one environment with its own session, cache, request scheduler and worker limit; return a result dict"""
+    result = {"name": target["name"], "url": target["url"], "ok": False, "charts": 0, "error": None}
+    started = time.time()
+    cache = MetadataCache(target_cache_path(target["name"]), ttl=CACHE_CONFIG["ttl"])
+    try:
+        scheduler = RequestScheduler(**{**SCHEDULER_CONFIG, **target.get("scheduler", {})})
+        auth = SupersetAuth(target["url"], target["username"], target["password"],
+                            cache=cache, session_store=session_store, scheduler=scheduler)
+        auth.authenticate()
+        chart_creator = SupersetChartCreator(auth)
+        dataset_id = target.get("dataset_id", DATASET_ID)
+        dashboard_title = target.get("dashboard_title", DASHBOARD_TITLE)
+
+        if mode == "import":
+            result["ok"] = chart_creator.import_charts(charts_config, dataset_id, dashboard_title, dry_run=dry_run)
+            result["charts"] = len(charts_config) if result["ok"] and not dry_run else 0
+            if not result["ok"]:
+                result["error"] = "bundle import failed" if not dry_run else "bundle could not be built"
+        else:
+            chart_ids = chart_creator.process_charts(
+                charts_config=charts_config,
+                dataset_id=dataset_id,
+                dashboard_title=dashboard_title,
+                max_workers=target.get("max_workers", MAX_WORKERS),
+                reconcile=RECONCILE_MODE,
+                dry_run=dry_run,
+                build_dashboard=AUTO_UPDATE_DASHBOARD
+            )
+            result["charts"] = len(chart_ids)
+            result["ok"] = dry_run or len(chart_ids) == len(charts_config)
+            if not result["ok"]:
+                result["error"] = f"{len(charts_config) - len(chart_ids)} charts failed"
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        cache.close()
+    result["seconds"] = round(time.time() - started, 1)
+    return result
+
+
+def run_fanout(targets, charts_config, max_targets=FANOUT_MAX_TARGETS, mode="process", dry_run=False):
+    """Provision all targets concurrently, at most max_targets at a time; results in inventory order"""
+    session_store = SessionStore(SESSION_STORE_PATH)
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_targets, len(targets)))) as executor:
+        futures = {
+            executor.submit(provision_target, target, charts_config, session_store, mode, dry_run): target["name"]
+            for target in targets
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            status = "✅" if result["ok"] else "❌"
+            print(f"{status} [{result['name']}] finished in {result['seconds']}s ({len(results)}/{len(targets)} done)")
+    return [results[target["name"]] for target in targets]
+
+
+def print_report(results):
+    """Print the consolidated per-environment result table"""
+    print(f"\n📋 FAN-OUT REPORT ({len(results)} environments)")
+    width = max((len(result["name"]) for result in results), default=0)
+    for result in results:
+        status = "OK" if result["ok"] else "FAILED"
+        line = f"   {result['name']:<{width}}  {status:<6}  {result['charts']:>4} charts  {result['seconds']:>7}s"
+        if result["error"]:
+            line += f"  {result['error']}"
+        print(line)
+    failed = [result["name"] for result in results if not result["ok"]]
+    print(f"\n{'❌' if failed else '✅'} {len(results) - len(failed)}/{len(results)} environments provisioned"
+          + (f"; failed: {', '.join(failed)}" if failed else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Provision charts on every configured Superset environment")
+    parser.add_argument("--targets", help="comma-separated environment names (default: all)")
+    parser.add_argument("--max-targets", type=int, default=FANOUT_MAX_TARGETS, help="environments provisioned at once")
+    parser.add_argument("--mode", choices=["process", "import"], default="process",
+                        help="per-chart create/update, or one import-bundle upload per environment")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="print each environment's plan (or build its bundle) without changes")
+    parser.add_argument("--report", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    targets = SUPERSET_ENVIRONMENTS
+    names = [target["name"] for target in targets]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        parser.error(f"duplicate environment names: {', '.join(sorted(duplicates))}")
+    if args.targets:
+        names = set(args.targets.split(","))
+        unknown = names - {target["name"] for target in targets}
+        if unknown:
+            parser.error(f"unknown environments: {', '.join(sorted(unknown))}")
+        targets = [target for target in targets if target["name"] in names]
+    if not targets:
+        print("❌ No environments configured in SUPERSET_ENVIRONMENTS")
+        return 1
+
+    if not validate_all_configs(CHARTS_CONFIG):
+        print("❌ Configuration validation failed")
+        return 1
+
+    print(f"🚀 Provisioning {len(CHARTS_CONFIG)} charts on {len(targets)} environments "
+          f"({args.max_targets} at a time)...")
+    results = run_fanout(targets, CHARTS_CONFIG, args.max_targets, args.mode, args.dry_run)
+    print_report(results)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Report written to {args.report}")
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
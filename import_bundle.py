@@ -0,0 +1,194 @@
+import io
+import json
+import re
+import uuid
+import zipfile
+from datetime import datetime, timezone
+import yaml
+from dashboard_layout import build_layout
+from superset_query import find_resources, iter_resource, make_filters
+
+# Namespace for deterministic UUIDs of charts/dashboards that don't exist yet, so re-importing
+# a config overwrites the same Superset objects instead of creating duplicates. Existing
+# objects (e.g. created through the REST API with random UUIDs) keep their own UUID.
+BUNDLE_NAMESPACE = uuid.UUID("5b0f3a8e-8f5c-4a57-9d2e-6c1f4f2b7a10")
+EXPORT_VERSION = "1.0.0"
+
+class SupersetBundleImporter:
+    def __init__(self, auth_instance):
+        self.auth = auth_instance
+        self.session = auth_instance.session
+        self.headers = auth_instance.headers
+        self.superset_url = auth_instance.superset_url
+
+    def export_dataset_bundle(self, dataset_id):
+        """Export the dataset (with its database) and return {path without root dir: bytes}"""
+        resp = self.session.get(
+            f"{self.superset_url}/api/v1/dataset/export/",
+            headers=self.headers,
+            params={"q": f"!({int(dataset_id)})"}
+        )
+        if resp.status_code != 200:
+            print(f"❌ Failed to export dataset {dataset_id}: {resp.status_code} - {resp.text}")
+            return None
+
+        files = {}
+        with zipfile.ZipFile(io.BytesIO(resp.content)) as bundle:
+            for name in bundle.namelist():
+                _, _, path = name.partition("/")
+                if path and path != "metadata.yaml":
+                    files[path] = bundle.read(name)
+        return files
+
+    def _dataset_uuid(self, files):
+        """UUID of the exported dataset"""
+        for path, content in files.items():
+            if path.startswith("datasets/"):
+                return yaml.safe_load(content)["uuid"]
+        return None
+
+    def existing_chart_uuids(self, slice_names, dataset_id):
+        """UUIDs of this dataset's existing charts with these names, from one paginated listing pass.
+
+        Charts of other datasets are never matched, so the import can't take them over.
+        """
+        wanted = set(slice_names)
+        uuids = {}
+        for chart in iter_resource(self.session, self.superset_url, self.headers, "chart",
+                                   columns=["id", "slice_name", "uuid", "datasource_id"],
+                                   filters=make_filters(datasource_id=int(dataset_id))):
+            if chart.get("datasource_id") != int(dataset_id):
+                continue
+            if chart["slice_name"] in wanted and chart.get("uuid"):
+                uuids.setdefault(chart["slice_name"], chart["uuid"])
+        return uuids
+
+    def _find_dashboard(self, **conditions):
+        """First dashboard matching exact server-side filters, or None"""
+        rows = find_resources(self.session, self.superset_url, self.headers, "dashboard", make_filters(**conditions),
+                              columns=["id", "dashboard_title", "slug", "uuid"], limit=1)
+        return rows[0] if rows else None
+
+    def _dashboard_identity(self, title, dataset_uuid):
+        """(uuid, slug) for the bundled dashboard.
+
+        A dashboard with this title keeps its UUID and slug, so the import updates it. A new
+        dashboard gets the deterministic UUID and a slug no other dashboard uses yet.
+        """
+        existing = self._find_dashboard(dashboard_title=title)
+        if existing and existing.get("uuid"):
+            return existing["uuid"], existing.get("slug")
+        base_slug = re.sub(r'[^a-z0-9\-]', '', title.lower().replace(" ", "-").replace("_", "-"))
+        slug, counter = base_slug, 1
+        while self._find_dashboard(slug=slug):
+            slug = f"{base_slug}-{counter}"
+            counter += 1
+        return str(uuid.uuid5(BUNDLE_NAMESPACE, f"{dataset_uuid}:dashboard:{title}")), slug
+
+    def _chart_yaml(self, payload, dataset_uuid, chart_uuid=None):
+        """Render one chart payload (as built by SupersetChartCreator) in the v1 export format"""
+        return {
+            "slice_name": payload["slice_name"],
+            "description": None,
+            "certified_by": None,
+            "certification_details": None,
+            "viz_type": payload["viz_type"],
+            "params": json.loads(payload["params"]),
+            "query_context": payload.get("query_context"),
+            "cache_timeout": None,
+            "uuid": chart_uuid or str(uuid.uuid5(BUNDLE_NAMESPACE, f"{dataset_uuid}:chart:{payload['slice_name']}")),
+            "version": EXPORT_VERSION,
+            "dataset_uuid": dataset_uuid
+        }
+
+    def _dashboard_position(self, charts):
+        """Packed ROOT -> GRID -> ROW -> CHART layout (tabbed for large bundles) for the bundled charts"""
+        return build_layout([
+            {"uuid": chart["uuid"], "name": chart["slice_name"], "viz_type": chart["viz_type"]}
+            for chart in charts
+        ])
+
+    def _dashboard_yaml(self, title, charts, dataset_uuid):
+        """Render a dashboard holding all bundled charts in the v1 export format"""
+        dashboard_uuid, slug = self._dashboard_identity(title, dataset_uuid)
+        return {
+            "dashboard_title": title,
+            "description": None,
+            "css": "",
+            "slug": slug,
+            "uuid": dashboard_uuid,
+            "position": self._dashboard_position(charts),
+            "metadata": {"color_scheme": "", "refresh_frequency": 0, "expanded_slices": {},
+                         "label_colors": {}, "timed_refresh_immune_slices": [], "cross_filters_enabled": True},
+            "version": EXPORT_VERSION,
+            "published": True
+        }
+
+    def build_bundle(self, payloads, dataset_id, dashboard_title=None):
+        """Assemble dataset, chart and optional dashboard YAML into an in-memory import ZIP"""
+        files = self.export_dataset_bundle(dataset_id)
+        if files is None:
+            return None
+        dataset_uuid = self._dataset_uuid(files)
+        if not dataset_uuid:
+            print(f"❌ Dataset export for {dataset_id} contained no dataset definition")
+            return None
+
+        try:
+            chart_uuids = self.existing_chart_uuids((payload["slice_name"] for payload in payloads), dataset_id)
+        except Exception as e:
+            print(f"❌ Failed to look up existing charts: {e}")
+            return None
+        charts = [self._chart_yaml(payload, dataset_uuid, chart_uuids.get(payload["slice_name"])) for payload in payloads]
+        for chart in charts:
+            name = re.sub(r"[^A-Za-z0-9_]", "_", chart["slice_name"])
+            files[f"charts/{name}_{chart['uuid'][:8]}.yaml"] = yaml.safe_dump(chart, sort_keys=False).encode()
+
+        if dashboard_title:
+            try:
+                dashboard = self._dashboard_yaml(dashboard_title, charts, dataset_uuid)
+            except Exception as e:
+                print(f"❌ Failed to look up existing dashboard '{dashboard_title}': {e}")
+                return None
+            name = re.sub(r"[^A-Za-z0-9_]", "_", dashboard_title)
+            files[f"dashboards/{name}.yaml"] = yaml.safe_dump(dashboard, sort_keys=False).encode()
+
+        metadata = {
+            "version": EXPORT_VERSION,
+            "type": "assets" if dashboard_title else "Slice",
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+        root = f"superset_automation_{datetime.now(timezone.utc):%Y%m%dT%H%M%S}"
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as bundle:
+            bundle.writestr(f"{root}/metadata.yaml", yaml.safe_dump(metadata))
+            for path, content in files.items():
+                bundle.writestr(f"{root}/{path}", content)
+
+        print(f"📦 Built import bundle with {len(charts)} charts ({len(buffer.getvalue())} bytes)")
+        return buffer.getvalue()
+
+    def import_bundle(self, bundle, with_dashboard=False, passwords=None):
+        """Upload a bundle in one request: assets import when it has a dashboard, chart import otherwise.
+
+        The assets import also overwrites the bundled database, so pass its password as
+        {"databases/<name>.yaml": "..."} when the database connection has one.
+        """
+        # Let requests set the multipart Content-Type
+        headers = {k: v for k, v in self.headers.items() if k != "Content-Type"}
+        if with_dashboard:
+            url = f"{self.superset_url}/api/v1/assets/import/"
+            files = {"bundle": ("bundle.zip", bundle, "application/zip")}
+            data = {"passwords": json.dumps(passwords or {})}
+        else:
+            url = f"{self.superset_url}/api/v1/chart/import/"
+            files = {"formData": ("bundle.zip", bundle, "application/zip")}
+            data = {"overwrite": "true", "passwords": json.dumps(passwords or {})}
+
+        resp = self.session.post(url, headers=headers, files=files, data=data)
+        if resp.status_code == 200:
+            print("✅ Bundle imported")
+            return True
+        else:
+            print(f"❌ Bundle import failed: {resp.status_code} - {resp.text}")
+            return False
@@ -1,22 +1,80 @@
+import argparse
+import glob
+import io
+import json
+import os
 import psycopg2
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime
+from loader_db import LoaderDatabase
 
 # === CONFIG ===
-CSV_FILE = "enhanced_qualtrics_data.csv"
-DB_HOST = "localhost"
-DB_PORT = 5432
-DB_NAME = "superset"
-DB_USER = "superset"
-DB_PASSWORD = "superset"
+CSV_FILE = "enhanced_qualtrics_data.csv"  # .parquet and .arrow/.feather (Arrow IPC) exports load the same way
+# Standard libpq environment variables override the defaults
+DB_HOST = os.environ.get("PGHOST", "localhost")
+DB_PORT = int(os.environ.get("PGPORT", 5432))
+DB_NAME = os.environ.get("PGDATABASE", "superset")
+DB_USER = os.environ.get("PGUSER", "superset")
+DB_PASSWORD = os.environ.get("PGPASSWORD", "superset")
+COMMIT_ROWS = int(os.environ.get("LOADER_COMMIT_ROWS", 200000))  # rows per transaction
+DB_RETRIES = int(os.environ.get("LOADER_DB_RETRIES", 3))  # retries of a transaction on transient errors
+RETRY_BACKOFF = 0.5  # seconds before the first retry, doubled on each attempt
+LOAD_MODE = "copy"  # "copy" streams rows through a staging table, "insert" upserts row by row
+INCREMENTAL_LOAD = True  # skip unchanged files and only send new or changed rows
+INDEX_MODE = "upfront"  # "upfront": create indexes before loading, "deferred": drop them for the load and
+                        # rebuild after (bulk backfills), "concurrent": build missing ones after the load
+                        # with CREATE INDEX CONCURRENTLY (tables serving queries)
+PARTITION_INTERVAL = None  # None, "month" or "quarter": range-partition a new table by date
+CHUNK_SIZE = 50000  # CSV rows read, prepared and loaded at a time (None loads the whole file at once)
+
+# Multi-file mode (python load_qualtrics_data.py --files "exports/*.csv")
+PARSE_WORKERS = 4  # processes parsing and preparing export files
+DB_WRITERS = 2  # concurrent database connections loading prepared files
+MANIFEST_FILE = ".qualtrics_manifest.json"  # files already loaded, keyed by path
+
+# Columns written to qualtrics_metrics2, in load order
+INSERT_COLUMNS = [
+    'date', 'nps_score', 'csat_score', 'ces_score', 'response_rate',
+    'completion_rate', 'responses_count', 'cx_composite_score',
+    'product_satisfaction', 'support_satisfaction', 'ease_of_use',
+    'value_score', 'day_of_week', 'month', 'week_number', 'quarter',
+    'is_weekend', 'performance_tier'
+]
+# Column dtypes for reading exports and for prepared frames: categoricals for repeated labels,
+# the smallest nullable ints/floats that hold each metric
+CSV_DTYPES = {
+    'nps_score': 'Int16',
+    'csat_score': 'Int16',
+    'ces_score': 'float32',
+    'response_rate': 'float32',
+    'completion_rate': 'float32',
+    'responses_count': 'Int32',
+    'cx_composite_score': 'float32',
+    'product_satisfaction': 'float32',
+    'support_satisfaction': 'float32',
+    'ease_of_use': 'float32',
+    'value_score': 'float32',
+    'day_of_week': 'category',
+    'month': 'category',
+    'week_number': 'Int8',
+    'quarter': 'category',
+    'is_weekend': 'Int8',
+    'performance_tier': 'category'
+}
+
+# Performance tiers by composite CX score: [-inf, 70) [70, 75) [75, 80) [80, inf)
+TIER_BINS = [-np.inf, 70, 75, 80, np.inf]
+TIER_LABELS = ['Needs Improvement', 'Average', 'Good', 'Excellent']
+
+# INSERT_COLUMNS plus the content hash used to detect changed rows
+LOAD_COLUMNS = INSERT_COLUMNS + ['row_hash']
 
 # === ENHANCED TABLE SETUP QUERY ===
-create_table_query = """
-CREATE TABLE IF NOT EXISTS qualtrics_metrics2 (
-    id SERIAL PRIMARY KEY,
-    date DATE UNIQUE NOT NULL,
-    
+metric_columns_ddl = """
     -- Core CX Metrics
     nps_score INTEGER,
     csat_score INTEGER,
@@ -42,21 +100,65 @@ CREATE TABLE IF NOT EXISTS qualtrics_metrics2 (
     -- Calculated Performance Tiers
     performance_tier VARCHAR(20),
     
+    -- Hash of the loaded values, used to skip unchanged rows
+    row_hash BIGINT,
+    
     -- Metadata
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""
+
+create_table_query = f"""
+CREATE TABLE IF NOT EXISTS qualtrics_metrics2 (
+    id SERIAL PRIMARY KEY,
+    date DATE UNIQUE NOT NULL,
+    {metric_columns_ddl}
 );
 """
 
+# Range-partitioned variant; unique constraints must include the partition key
+create_partitioned_table_query = f"""
+CREATE TABLE IF NOT EXISTS qualtrics_metrics2 (
+    id SERIAL,
+    date DATE NOT NULL,
+    {metric_columns_ddl},
+    
+    PRIMARY KEY (id, date),
+    UNIQUE (date)
+) PARTITION BY RANGE (date);
+"""
+
+is_partitioned_query = """
+SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'qualtrics_metrics2'::regclass);
+"""
+
+# Add columns introduced after the table was first created
+migrate_table_query = """
+ALTER TABLE qualtrics_metrics2 ADD COLUMN IF NOT EXISTS row_hash BIGINT;
+"""
+
+# Secondary indexes for better query performance (the date unique constraint is kept for upserts)
+SECONDARY_INDEXES = {
+    'idx_qualtrics_date': 'date',
+    'idx_qualtrics_month': 'month',
+    'idx_qualtrics_quarter': 'quarter',
+    'idx_qualtrics_weekend': 'is_weekend',
+    'idx_qualtrics_performance': 'performance_tier',
+    'idx_qualtrics_nps': 'nps_score',
+    'idx_qualtrics_composite': 'cx_composite_score'
+}
+
 # Create indexes for better query performance
-create_indexes_query = """
-CREATE INDEX IF NOT EXISTS idx_qualtrics_date ON qualtrics_metrics2(date);
-CREATE INDEX IF NOT EXISTS idx_qualtrics_month ON qualtrics_metrics2(month);
-CREATE INDEX IF NOT EXISTS idx_qualtrics_quarter ON qualtrics_metrics2(quarter);
-CREATE INDEX IF NOT EXISTS idx_qualtrics_weekend ON qualtrics_metrics2(is_weekend);
-CREATE INDEX IF NOT EXISTS idx_qualtrics_performance ON qualtrics_metrics2(performance_tier);
-CREATE INDEX IF NOT EXISTS idx_qualtrics_nps ON qualtrics_metrics2(nps_score);
-CREATE INDEX IF NOT EXISTS idx_qualtrics_composite ON qualtrics_metrics2(cx_composite_score);
+create_indexes_query = "".join(
+    f"CREATE INDEX IF NOT EXISTS {name} ON qualtrics_metrics2({column});\n"
+    for name, column in SECONDARY_INDEXES.items()
+)
+
+drop_indexes_query = "".join(f"DROP INDEX IF EXISTS {name};\n" for name in SECONDARY_INDEXES)
+
+# Indexes left INVALID by an interrupted CREATE INDEX CONCURRENTLY
+invalid_indexes_query = """
+SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+WHERE NOT i.indisvalid AND c.relname = ANY(%s);
 """
 
 # Insert query for all columns
@@ -65,10 +167,10 @@ INSERT INTO qualtrics_metrics2 (
     date, nps_score, csat_score, ces_score, response_rate, completion_rate,
     responses_count, cx_composite_score, product_satisfaction, support_satisfaction,
     ease_of_use, value_score, day_of_week, month, week_number, quarter,
-    is_weekend, performance_tier
+    is_weekend, performance_tier, row_hash
 )
 VALUES (
-    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
 )
 ON CONFLICT (date) DO UPDATE SET
     nps_score = EXCLUDED.nps_score,
@@ -88,24 +190,72 @@ ON CONFLICT (date) DO UPDATE SET
     quarter = EXCLUDED.quarter,
     is_weekend = EXCLUDED.is_weekend,
     performance_tier = EXCLUDED.performance_tier,
-    updated_at = CURRENT_TIMESTAMP;
+    row_hash = EXCLUDED.row_hash,
+    updated_at = CURRENT_TIMESTAMP
+WHERE qualtrics_metrics2.row_hash IS DISTINCT FROM EXCLUDED.row_hash;
+"""
+
+# Session-local staging table for COPY loads, shaped like the target columns
+create_staging_query = f"""
+CREATE TEMP TABLE IF NOT EXISTS qualtrics_staging AS
+SELECT {", ".join(LOAD_COLUMNS)} FROM qualtrics_metrics2 WITH NO DATA;
+TRUNCATE qualtrics_staging;
+"""
+
+copy_query = f"""
+COPY qualtrics_staging ({", ".join(LOAD_COLUMNS)}) FROM STDIN WITH (FORMAT csv)
+"""
+
+# Merge the staged rows into the target in one statement (date order keeps concurrent writers
+# from deadlocking); rows whose hash is unchanged are left alone
+merge_query = f"""
+INSERT INTO qualtrics_metrics2 ({", ".join(LOAD_COLUMNS)})
+SELECT {", ".join(LOAD_COLUMNS)} FROM qualtrics_staging
+ORDER BY date
+ON CONFLICT (date) DO UPDATE SET
+    {", ".join(f"{col} = EXCLUDED.{col}" for col in LOAD_COLUMNS if col != 'date')},
+    updated_at = CURRENT_TIMESTAMP
+WHERE qualtrics_metrics2.row_hash IS DISTINCT FROM EXCLUDED.row_hash;
 """
 
-def calculate_performance_tier(cx_score):
-    """Calculate performance tier based on composite CX score"""
-    if cx_score >= 80:
-        return 'Excellent'
-    elif cx_score >= 75:
-        return 'Good'
-    elif cx_score >= 70:
-        return 'Average'
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+
+def iter_export(path, chunk_size=None):
+    """Yield an export as DataFrames of at most chunk_size rows (Arrow IPC yields its record batches),
+    reading only the columns the loader uses. Parquet and Arrow files are memory-mapped.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in PARQUET_EXTENSIONS:
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        columns = [col for col in INSERT_COLUMNS if col in parquet_file.schema_arrow.names]
+        if chunk_size:
+            for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+                yield batch.to_pandas()
+        else:
+            yield parquet_file.read(columns=columns).to_pandas()
+    elif extension in ARROW_EXTENSIONS:
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            columns = [col for col in INSERT_COLUMNS if col in reader.schema.names]
+            if chunk_size:
+                for i in range(reader.num_record_batches):
+                    yield reader.get_batch(i).select(columns).to_pandas()
+            else:
+                yield reader.read_all().select(columns).to_pandas()
+    elif chunk_size:
+        yield from read_export(path, chunksize=chunk_size)
     else:
-        return 'Needs Improvement'
+        yield read_export(path)
 
-def prepare_data(df):
-    """Prepare and validate data for insertion"""
-    print("🔧 Preparing data...")
-    
+def read_export(path, **kwargs):
+    """Read a whole export (CSV with the CSV_DTYPES schema, or Parquet/Arrow) limited to INSERT_COLUMNS"""
+    if os.path.splitext(path)[1].lower() in PARQUET_EXTENSIONS + ARROW_EXTENSIONS:
+        return next(iter_export(path))
+    return pd.read_csv(path, dtype=CSV_DTYPES, parse_dates=['date'], usecols=lambda col: col in INSERT_COLUMNS, **kwargs)
+
+def prepare_frame(df):
+    """Clean and type the CSV data, returning a DataFrame with LOAD_COLUMNS in load order"""
     # Handle missing values
     df = df.fillna({
         'nps_score': 0,
@@ -128,27 +278,14 @@ def prepare_data(df):
         df['week_number'] = pd.to_datetime(df['date']).dt.isocalendar().week
     
     if 'performance_tier' not in df.columns:
-        df['performance_tier'] = df['cx_composite_score'].apply(calculate_performance_tier)
+        df['performance_tier'] = pd.cut(df['cx_composite_score'], bins=TIER_BINS, labels=TIER_LABELS, right=False)
     
-    # Data type conversions
+    # Data type conversions (no-ops for frames read with read_export)
     df['date'] = pd.to_datetime(df['date'])
-    df['nps_score'] = df['nps_score'].astype(int)
-    df['csat_score'] = df['csat_score'].astype(int)
-    df['responses_count'] = df['responses_count'].astype(int)
-    df['week_number'] = df['week_number'].astype(int)
-    df['is_weekend'] = df['is_weekend'].astype(int)
-    
-    # Convert DataFrame to list of tuples for insertion
-    columns = [
-        'date', 'nps_score', 'csat_score', 'ces_score', 'response_rate',
-        'completion_rate', 'responses_count', 'cx_composite_score',
-        'product_satisfaction', 'support_satisfaction', 'ease_of_use',
-        'value_score', 'day_of_week', 'month', 'week_number', 'quarter',
-        'is_weekend', 'performance_tier'
-    ]
+    df = df.astype({col: dtype for col, dtype in CSV_DTYPES.items() if col in df.columns})
     
     # Ensure all required columns exist
-    for col in columns:
+    for col in INSERT_COLUMNS:
         if col not in df.columns:
             print(f"⚠️ Missing column '{col}', creating with default values")
             if col in ['day_of_week', 'month', 'quarter', 'performance_tier']:
@@ -156,13 +293,115 @@ def prepare_data(df):
             else:
                 df[col] = 0
     
-    rows = df[columns].values.tolist()
-    return rows
+    frame = df[INSERT_COLUMNS].copy()
+    frame['row_hash'] = row_hash(frame)
+    return frame
+
+def row_hash(frame):
+    """64-bit content hash per row over normalized values (numbers as rounded float64, labels by value),
+    so it does not depend on the dtypes an export was read with"""
+    normalized = pd.DataFrame({
+        col: frame[col].astype('float64').round(4) if pd.api.types.is_numeric_dtype(frame[col]) else frame[col]
+        for col in INSERT_COLUMNS
+    })
+    hashes = pd.util.hash_pandas_object(normalized, index=False)
+    return hashes.values.view(np.int64)
+
+def filter_changed(cur, frame):
+    """Drop rows already stored with the same hash; rows past the table's latest date are always new"""
+    cur.execute("SELECT MAX(date) FROM qualtrics_metrics2;")
+    high_water_mark = cur.fetchone()[0]
+    if high_water_mark is None:
+        return frame
+
+    dates = frame['date'].dt.date
+    known = frame[dates <= high_water_mark]
+    if known.empty:
+        return frame
+
+    cur.execute(
+        "SELECT date, row_hash FROM qualtrics_metrics2 WHERE date BETWEEN %s AND %s;",
+        (known['date'].min().date(), known['date'].max().date())
+    )
+    stored_hashes = dict(cur.fetchall())
+    unchanged = np.array([stored_hashes.get(d) == h for d, h in zip(dates, frame['row_hash'])], dtype=bool)
+    return frame[~unchanged]
+
+def prepare_data(df):
+    """Prepare and validate data for insertion as a list of row tuples"""
+    return prepare_frame(df).values.tolist()
 
-def validate_connection(conn):
+def copy_frame(cur, frame):
+    """Stream a prepared frame into a staging table with COPY and merge it with one upsert"""
+    # A single INSERT ... ON CONFLICT cannot touch the same date twice; keep the last row like row-by-row upserts did
+    frame = frame.drop_duplicates(subset='date', keep='last')
+
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False, header=False, date_format='%Y-%m-%d')
+    buffer.seek(0)
+
+    cur.execute(create_staging_query)
+    cur.copy_expert(copy_query, buffer)
+    cur.execute(merge_query)
+    return len(frame)
+
+def insert_rows(cur, rows, batch_size=100):
+    """Upsert rows with executemany in batches"""
+    inserted_count = 0
+    for i in range(0, len(rows), batch_size):
+        batch = rows[i:i + batch_size]
+        cur.executemany(insert_query, batch)
+        inserted_count += len(batch)
+        
+        if inserted_count % 500 == 0 or inserted_count == len(rows):
+            print(f"  📈 Processed {inserted_count}/{len(rows)} records...")
+    return inserted_count
+
+def load_frame(cur, frame):
+    """Load one prepared frame with the configured LOAD_MODE and return the number of rows sent"""
+    if INCREMENTAL_LOAD:
+        frame = filter_changed(cur, frame)
+        if frame.empty:
+            return 0
+    if LOAD_MODE == "copy":
+        return copy_frame(cur, frame)
+    return insert_rows(cur, frame.values.tolist())
+
+def load_export(db, path, chunk_size=CHUNK_SIZE, commit_rows=COMMIT_ROWS):
+    """Stream an export into the database chunk by chunk, committing about every commit_rows rows.
+
+    Memory stays bounded by commit_rows: prepared chunks are kept until their transaction
+    commits so a retried transaction can resend them.
+    """
+    total_count = 0
+    pending, pending_rows = [], 0
+
+    def commit(frames):
+        ensure_partitions(db, frames)
+        return db.run(lambda cur: sum(load_frame(cur, frame) for frame in frames))
+
+    for chunk_number, chunk in enumerate(iter_export(path, chunk_size), 1):
+        if chunk_number == 1:
+            print(f"📊 Columns: {list(chunk.columns)}")
+            print(f"\n📋 Sample data:")
+            print(chunk.head(3).to_string(index=False))
+            print(f"\n⬆️ Loading rows ({LOAD_MODE} mode, {chunk_size or 'single'} chunk size)...")
+
+        pending.append(prepare_frame(chunk))
+        pending_rows += len(chunk)
+        if pending_rows >= commit_rows:
+            total_count += commit(pending)
+            pending, pending_rows = [], 0
+            print(f"  📈 Chunk {chunk_number}: committed, {total_count} records loaded so far")
+
+    if pending:
+        total_count += commit(pending)
+        print(f"  📈 Chunk {chunk_number}: committed, {total_count} records loaded")
+    return total_count
+
+def validate_connection(db):
     """Test database connection and permissions"""
-    try:
-        cur = conn.cursor()
+    def check(cur):
         cur.execute("SELECT version();")
         version = cur.fetchone()
         print(f"✅ Connected to PostgreSQL: {version[0]}")
@@ -171,13 +410,249 @@ def validate_connection(conn):
         cur.execute("SELECT current_user, current_database();")
         user_db = cur.fetchone()
         print(f"✅ User: {user_db[0]}, Database: {user_db[1]}")
-        
-        cur.close()
+
+    try:
+        db.run(check)
         return True
     except Exception as e:
         print(f"❌ Connection validation failed: {e}")
         return False
 
+def open_database(pool_size=1):
+    """Connection pool for the configured database"""
+    return LoaderDatabase(DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD,
+                          pool_size=pool_size, retries=DB_RETRIES, backoff=RETRY_BACKOFF)
+
+def ensure_schema(cur):
+    """Create the target table (partitioned if configured) and, in upfront mode, its indexes"""
+    print(f"\n🛠️ Creating table structure...")
+    cur.execute(create_partitioned_table_query if PARTITION_INTERVAL else create_table_query)
+    cur.execute(migrate_table_query)
+    if PARTITION_INTERVAL:
+        if not is_partitioned(cur):
+            raise Exception("qualtrics_metrics2 already exists unpartitioned; migrate it or set PARTITION_INTERVAL = None")
+        print(f"✅ Table 'qualtrics_metrics2' created/verified (partitioned by {PARTITION_INTERVAL})")
+    else:
+        print("✅ Table 'qualtrics_metrics2' created/verified")
+    
+    if INDEX_MODE == "upfront":
+        print("🔍 Creating indexes...")
+        cur.execute(create_indexes_query)
+        print("✅ Indexes created/verified")
+
+def is_partitioned(cur):
+    """True if qualtrics_metrics2 is a partitioned table"""
+    cur.execute(is_partitioned_query)
+    return cur.fetchone()[0]
+
+def invalid_indexes(cur):
+    """Names of secondary indexes left invalid by an interrupted concurrent build"""
+    cur.execute(invalid_indexes_query, (list(SECONDARY_INDEXES),))
+    return [row[0] for row in cur.fetchall()]
+
+def before_load(db):
+    """In deferred index mode, drop secondary indexes so rows are loaded without index maintenance"""
+    if INDEX_MODE == "deferred":
+        print("🔍 Dropping secondary indexes until the load finishes...")
+        db.run(lambda cur: cur.execute(drop_indexes_query))
+
+def after_load(db):
+    """Build the indexes skipped for the load (CONCURRENTLY when INDEX_MODE is "concurrent")"""
+    if INDEX_MODE == "upfront":
+        return
+
+    started = datetime.now()
+    # Partitioned parents cannot be indexed concurrently; a plain build cascades to every partition
+    if INDEX_MODE == "concurrent" and not db.run(is_partitioned):
+        print("🔍 Building indexes concurrently...")
+        for name in db.run(invalid_indexes):
+            db.run_autocommit(f"DROP INDEX CONCURRENTLY IF EXISTS {name};")
+        for name, column in SECONDARY_INDEXES.items():
+            db.run_autocommit(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON qualtrics_metrics2({column});")
+    else:
+        print("🔍 Building indexes...")
+        db.run(lambda cur: cur.execute(create_indexes_query))
+    print(f"✅ Indexes built in {(datetime.now() - started).total_seconds():.1f}s")
+
+# Partitions created by this process, so each is only checked once
+_known_partitions = set()
+
+def ensure_partitions(db, frames):
+    """Create the date-range partitions the frames need, in a short transaction of their own"""
+    if not PARTITION_INTERVAL:
+        return
+    frequency = {"month": "M", "quarter": "Q"}[PARTITION_INTERVAL]
+    periods = set()
+    for frame in frames:
+        periods.update(frame['date'].dt.to_period(frequency).unique())
+    periods -= _known_partitions
+    if not periods:
+        return
+
+    def create(cur):
+        # Serialize partition DDL between concurrent writers
+        cur.execute("SELECT pg_advisory_xact_lock(hashtext('qualtrics_metrics2_partitions'));")
+        for period in sorted(periods):
+            suffix = f"{period.year}_{period.month:02d}" if frequency == "M" else f"{period.year}_q{period.quarter}"
+            cur.execute(
+                f"CREATE TABLE IF NOT EXISTS qualtrics_metrics2_p{suffix} PARTITION OF qualtrics_metrics2 "
+                f"FOR VALUES FROM (%s) TO (%s);",
+                (period.start_time.date(), (period + 1).start_time.date())
+            )
+
+    db.run(create)
+    _known_partitions.update(periods)
+
+def prepare_file(path):
+    """Read and prepare one export file (runs in a worker process)"""
+    return prepare_frame(read_export(path))
+
+def load_manifest(manifest_file=MANIFEST_FILE):
+    """Return {path: load record} for files loaded by earlier runs"""
+    try:
+        with open(manifest_file) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_manifest(manifest, manifest_file=MANIFEST_FILE):
+    """Write the manifest atomically"""
+    tmp_path = f"{manifest_file}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_file)
+
+def file_signature(path):
+    """Size and modification time, used to tell whether a listed file changed since it was loaded"""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+def already_loaded(manifest, path):
+    """True if the manifest records this file with its current size and mtime"""
+    record = manifest.get(path, {})
+    return {k: record.get(k) for k in ("size", "mtime")} == file_signature(path)
+
+def write_files(db, pending, manifest, manifest_file, parse_workers, writers):
+    """Parse pending files in a process pool and write them with `writers` connections,
+    recording each loaded file in the manifest. Returns (loaded paths, failed paths).
+    """
+    def write(frame):
+        # One transaction per file, so a file is either fully loaded or not recorded in the manifest
+        ensure_partitions(db, [frame])
+        return db.run(lambda cur: load_frame(cur, frame))
+
+    loaded, failed = [], []
+    remaining = iter(pending)
+    parsing, writing = {}, {}
+    # Prepared frames waiting for a writer are held in memory, so cap files in flight
+    max_in_flight = parse_workers + writers * 2
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as parsers, ThreadPoolExecutor(max_workers=writers) as db_pool:
+        def fill():
+            while len(parsing) + len(writing) < max_in_flight:
+                path = next(remaining, None)
+                if path is None:
+                    return
+                parsing[parsers.submit(prepare_file, path)] = path
+
+        fill()
+        while parsing or writing:
+            done, _ = wait(list(parsing) + list(writing), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in parsing:
+                    path = parsing.pop(future)
+                    try:
+                        writing[db_pool.submit(write, future.result())] = path
+                    except Exception as e:
+                        failed.append(path)
+                        print(f"  ❌ [{len(loaded) + len(failed)}/{len(pending)}] {path}: parse failed - {e}")
+                    continue
+
+                path = writing.pop(future)
+                try:
+                    row_count = future.result()
+                except Exception as e:
+                    failed.append(path)
+                    print(f"  ❌ [{len(loaded) + len(failed)}/{len(pending)}] {path}: load failed - {e}")
+                    continue
+                loaded.append(path)
+                manifest[path] = {**file_signature(path), "rows": row_count, "loaded_at": datetime.now().isoformat()}
+                save_manifest(manifest, manifest_file)
+                print(f"  📄 [{len(loaded) + len(failed)}/{len(pending)}] {path}: {row_count} records loaded")
+            fill()
+
+    return loaded, failed
+
+def load_files(pattern, parse_workers=PARSE_WORKERS, db_writers=DB_WRITERS, manifest_file=MANIFEST_FILE):
+    """Load every export matching a glob: files are parsed in a process pool and written by a
+    bounded set of connections. With INCREMENTAL_LOAD, as in main(), files already in the
+    manifest and unchanged are skipped. Returns (loaded paths, failed paths).
+    """
+    paths = sorted(glob.glob(pattern, recursive=True))
+    manifest = load_manifest(manifest_file)
+    pending = [path for path in paths if not (INCREMENTAL_LOAD and already_loaded(manifest, path))]
+    print(f"📂 {len(paths)} files match '{pattern}', {len(paths) - len(pending)} already loaded, {len(pending)} to load")
+    if not pending:
+        return [], []
+
+    writers = min(db_writers, len(pending))
+    db = open_database(pool_size=writers)
+    try:
+        db.run(ensure_schema)
+        before_load(db)
+        try:
+            loaded, failed = write_files(db, pending, manifest, manifest_file, parse_workers, writers)
+        finally:
+            # Rebuilds indexes dropped in deferred mode even if a worker raised
+            after_load(db)
+    finally:
+        db.close()
+
+    print(f"✅ Loaded {len(loaded)} files" + (f", ❌ {len(failed)} failed" if failed else ""))
+    return loaded, failed
+
+def print_database_summary(cur):
+    """Print row counts, date range, averages and the tier distribution of qualtrics_metrics2"""
+    cur.execute("SELECT COUNT(*) FROM qualtrics_metrics2;")
+    total_count = cur.fetchone()[0]
+    
+    # Get date range
+    cur.execute("SELECT MIN(date), MAX(date) FROM qualtrics_metrics2;")
+    date_range = cur.fetchone()
+    
+    # Get some statistics
+    cur.execute("""
+        SELECT 
+            ROUND(AVG(nps_score), 1) as avg_nps,
+            ROUND(AVG(csat_score), 1) as avg_csat,
+            ROUND(AVG(cx_composite_score), 1) as avg_cx,
+            COUNT(DISTINCT performance_tier) as tier_count
+        FROM qualtrics_metrics2;
+    """)
+    stats = cur.fetchone()
+    
+    print(f"\n✅ Data insertion completed successfully!")
+    print(f"📊 Database Summary:")
+    print(f"   Total records: {total_count}")
+    print(f"   Date range: {date_range[0]} to {date_range[1]}")
+    print(f"   Average NPS: {stats[0]}")
+    print(f"   Average CSAT: {stats[1]}")
+    print(f"   Average CX Score: {stats[2]}")
+    print(f"   Performance tiers: {stats[3]}")
+    
+    # Show performance tier distribution
+    cur.execute("""
+        SELECT performance_tier, COUNT(*) as count, 
+               ROUND(COUNT(*)::decimal / (SELECT COUNT(*) FROM qualtrics_metrics2) * 100, 1) as percentage
+        FROM qualtrics_metrics2 
+        GROUP BY performance_tier 
+        ORDER BY count DESC;
+    """)
+    
+    print(f"\n🎯 Performance Tier Distribution:")
+    for tier_data in cur.fetchall():
+        print(f"   {tier_data[0]}: {tier_data[1]} days ({tier_data[2]}%)")
+
 def main():
     try:
         # Read CSV file
@@ -187,104 +662,37 @@ def main():
             print("💡 Make sure you have generated the enhanced dataset first.")
             return
         
-        df = pd.read_csv(CSV_FILE)
-        print(f"✅ Loaded {len(df)} records from CSV")
-        print(f"📊 Columns: {list(df.columns)}")
-        
-        # Show data sample
-        print(f"\n📋 Sample data:")
-        print(df.head(3).to_string(index=False))
-        
-        # Prepare data
-        rows = prepare_data(df)
-        print(f"✅ Prepared {len(rows)} rows for insertion")
-        
         # Connect to database
         print(f"\n🔗 Connecting to PostgreSQL...")
         print(f"Host: {DB_HOST}:{DB_PORT}, Database: {DB_NAME}, User: {DB_USER}")
         
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            port=DB_PORT,
-            dbname=DB_NAME,
-            user=DB_USER,
-            password=DB_PASSWORD
-        )
-        conn.autocommit = True
+        db = open_database()
         
         # Validate connection
-        if not validate_connection(conn):
+        if not validate_connection(db):
             return
         
-        cur = conn.cursor()
-        
         # Create table and indexes
-        print(f"\n🛠️ Creating table structure...")
-        cur.execute(create_table_query)
-        print("✅ Table 'qualtrics_metrics2' created/verified")
-        
-        print("🔍 Creating indexes...")
-        cur.execute(create_indexes_query)
-        print("✅ Indexes created/verified")
+        db.run(ensure_schema)
         
         # Insert data
-        print(f"\n⬆️ Inserting {len(rows)} rows...")
-        
-        # Insert in batches for better performance
-        batch_size = 100
-        inserted_count = 0
-        
-        for i in range(0, len(rows), batch_size):
-            batch = rows[i:i + batch_size]
-            cur.executemany(insert_query, batch)
-            inserted_count += len(batch)
-            
-            if inserted_count % 500 == 0 or inserted_count == len(rows):
-                print(f"  📈 Processed {inserted_count}/{len(rows)} records...")
+        manifest = load_manifest()
+        if INCREMENTAL_LOAD and already_loaded(manifest, CSV_FILE):
+            print(f"⏭️ '{CSV_FILE}' unchanged since {manifest[CSV_FILE]['loaded_at']}, nothing to load")
+        else:
+            print("🔧 Preparing and loading data...")
+            before_load(db)
+            try:
+                loaded_count = load_export(db, CSV_FILE)
+            finally:
+                after_load(db)
+            print(f"✅ Sent {loaded_count} new or changed records from '{CSV_FILE}'")
+            manifest[CSV_FILE] = {**file_signature(CSV_FILE), "rows": loaded_count, "loaded_at": datetime.now().isoformat()}
+            save_manifest(manifest)
         
         # Verify insertion
-        cur.execute("SELECT COUNT(*) FROM qualtrics_metrics2;")
-        total_count = cur.fetchone()[0]
-        
-        # Get date range
-        cur.execute("SELECT MIN(date), MAX(date) FROM qualtrics_metrics2;")
-        date_range = cur.fetchone()
-        
-        # Get some statistics
-        cur.execute("""
-            SELECT 
-                ROUND(AVG(nps_score), 1) as avg_nps,
-                ROUND(AVG(csat_score), 1) as avg_csat,
-                ROUND(AVG(cx_composite_score), 1) as avg_cx,
-                COUNT(DISTINCT performance_tier) as tier_count
-            FROM qualtrics_metrics2;
-        """)
-        stats = cur.fetchone()
-        
-        print(f"\n✅ Data insertion completed successfully!")
-        print(f"📊 Database Summary:")
-        print(f"   Total records: {total_count}")
-        print(f"   Date range: {date_range[0]} to {date_range[1]}")
-        print(f"   Average NPS: {stats[0]}")
-        print(f"   Average CSAT: {stats[1]}")
-        print(f"   Average CX Score: {stats[2]}")
-        print(f"   Performance tiers: {stats[3]}")
-        
-        # Show performance tier distribution
-        cur.execute("""
-            SELECT performance_tier, COUNT(*) as count, 
-                   ROUND(COUNT(*)::decimal / (SELECT COUNT(*) FROM qualtrics_metrics2) * 100, 1) as percentage
-            FROM qualtrics_metrics2 
-            GROUP BY performance_tier 
-            ORDER BY count DESC;
-        """)
-        
-        print(f"\n🎯 Performance Tier Distribution:")
-        for tier_data in cur.fetchall():
-            print(f"   {tier_data[0]}: {tier_data[1]} days ({tier_data[2]}%)")
-            
-        cur.close()
-        conn.close()
+        db.run(print_database_summary)
+        db.close()
         
         print(f"\n🎉 Ready for Superset!")
         print(f"💡 Your dataset ID in Superset should point to the 'qualtrics_metrics2' table")
@@ -304,4 +712,11 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Load Qualtrics exports into PostgreSQL")
+    parser.add_argument("--files", help="glob of export files to load in parallel, e.g. 'exports/**/*.csv'")
+    args = parser.parse_args()
+
+    if args.files:
+        load_files(args.files)
+    else:
+        main()
\ No newline at end of file
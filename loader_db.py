@@ -0,0 +1,105 @@
+import random
+import time
+from contextlib import contextmanager
+import psycopg2
+import psycopg2.pool
+
+# SQLSTATEs worth retrying besides serialization failures/deadlocks (TransactionRollbackError):
+# connection exceptions (class 08) and server shutdown/startup (57P01-57P03)
+TRANSIENT_PGCODE_CLASSES = ("08",)
+TRANSIENT_PGCODES = {"57P01", "57P02", "57P03"}
+# libpq messages of failed or dropped connections, which carry no SQLSTATE; authentication and
+# configuration errors (bad password, unknown database) are not among them and fail at once
+CONNECTION_LOSS_MESSAGES = (
+    "could not connect", "connection refused", "timeout expired", "server closed the connection",
+    "terminating connection", "the database system is", "no connection to the server",
+)
+
+
+def is_transient(error, conn=None):
+    """Whether a psycopg2 error is worth retrying: a rollback-class conflict or a lost connection"""
+    if isinstance(error, psycopg2.extensions.TransactionRollbackError):
+        return True
+    if isinstance(error, psycopg2.InterfaceError) or (conn is not None and conn.closed):
+        return True
+    pgcode = getattr(error, "pgcode", None)
+    if pgcode:
+        return pgcode.startswith(TRANSIENT_PGCODE_CLASSES) or pgcode in TRANSIENT_PGCODES
+    message = str(error).lower()
+    return isinstance(error, psycopg2.OperationalError) and any(m in message for m in CONNECTION_LOSS_MESSAGES)
+
+
+class LoaderDatabase:
+    """Pooled Postgres connections for the loaders, with transactional units of work and retries.
+
+    Connections are not autocommit: each run() is one transaction that is committed on success,
+    rolled back on error and retried with jittered exponential backoff on transient errors.
+    Work passed to run() must therefore be safe to repeat (the loaders' upserts are). The pool
+    connects lazily, so a database that is still starting up is retried by the first run().
+    """
+
+    def __init__(self, host, port, dbname, user, password, pool_size=4, retries=3, backoff=0.5):
+        self.pool = psycopg2.pool.ThreadedConnectionPool(
+            0, pool_size, host=host, port=port, dbname=dbname, user=user, password=password
+        )
+        self.retries = retries
+        self.backoff = backoff
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection; it is discarded instead of returned if it was closed"""
+        conn = self.pool.getconn()
+        try:
+            yield conn
+        finally:
+            self.pool.putconn(conn, close=bool(conn.closed))
+
+    def run(self, work, retries=None):
+        """Run work(cursor) in one transaction and return its result, retrying transient errors.
+
+        Opening the pooled connection is part of the retried attempt, so a refused or reset
+        connection is retried too; a broken connection is discarded instead of returned.
+        """
+        retries = self.retries if retries is None else retries
+        for attempt in range(retries + 1):
+            conn = None
+            try:
+                with self.connection() as conn:
+                    try:
+                        with conn.cursor() as cur:
+                            result = work(cur)
+                        conn.commit()
+                        return result
+                    except Exception:
+                        self._rollback(conn)
+                        raise
+            except psycopg2.Error as e:
+                if attempt == retries or not is_transient(e, conn):
+                    raise
+                delay = self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+                print(f"  🔁 Transient database error ({type(e).__name__}: {str(e).strip()}), "
+                      f"retry {attempt + 1}/{retries} in {delay:.1f}s...")
+            time.sleep(delay)
+
+    def run_autocommit(self, sql, params=None):
+        """Execute one statement outside a transaction, e.g. CREATE INDEX CONCURRENTLY"""
+        with self.connection() as conn:
+            conn.autocommit = True
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(sql, params)
+            finally:
+                if not conn.closed:
+                    conn.autocommit = False
+
+    def _rollback(self, conn):
+        """Roll back if the connection is still usable"""
+        if not conn.closed:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                conn.close()
+
+    def close(self):
+        """Close every pooled connection"""
+        self.pool.closeall()
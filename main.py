@@ -6,10 +6,21 @@ Simple main script for creating Superset charts.
 import sys
 from auth import SupersetAuth
 from chart_creator import SupersetChartCreator
+from metadata_cache import MetadataCache
+from request_scheduler import RequestScheduler
+from session_store import SessionStore
 from chart_configs import (
     SUPERSET_CONFIG, 
+    CACHE_CONFIG,
+    SCHEDULER_CONFIG,
+    SESSION_STORE_PATH,
     DATASET_ID, 
     DASHBOARD_TITLE,
+    MAX_WORKERS,
+    RECONCILE_MODE,
+    DRY_RUN,
+    AUTO_UPDATE_DASHBOARD,
+    DEBUG_PAYLOADS,
     CHARTS_CONFIG,
     BIG_NUMBER_CHARTS,
     LINE_CHARTS,
@@ -30,13 +41,16 @@ def main():
         auth = SupersetAuth(
             superset_url=SUPERSET_CONFIG["url"],
             username=SUPERSET_CONFIG["username"], 
-            password=SUPERSET_CONFIG["password"]
+            password=SUPERSET_CONFIG["password"],
+            cache=MetadataCache(**CACHE_CONFIG),
+            session_store=SessionStore(SESSION_STORE_PATH),
+            scheduler=RequestScheduler(**SCHEDULER_CONFIG)
         )
         session, headers = auth.authenticate()
         print("✅ Authentication successful")
         
         # Initialize chart creator
-        chart_creator = SupersetChartCreator(auth)
+        chart_creator = SupersetChartCreator(auth, debug=DEBUG_PAYLOADS)
         
         # Test dataset
         if not chart_creator.test_dataset_query(DATASET_ID):
@@ -53,8 +67,9 @@ def main():
         print("6. Test Single Chart")
         print("7. Copy Working Chart")
         print("8. Analyze Working Chart Config")
+        print("9. Bulk Import All Charts (single request)")
         
-        choice = input("\nEnter choice (1-8): ").strip() or "1"
+        choice = input("\nEnter choice (1-9): ").strip() or "1"
         
         # Select charts
         if choice == "1":
@@ -92,6 +107,13 @@ def main():
             
             analyze_working_chart(chart_creator, chart_name)
             return
+        elif choice == "9":
+            # Upload all charts (and the dashboard) as one import bundle
+            if chart_creator.import_charts(CHARTS_CONFIG, DATASET_ID, dashboard_title=DASHBOARD_TITLE):
+                print(f"✅ Imported {len(CHARTS_CONFIG)} charts into '{DASHBOARD_TITLE}'")
+            else:
+                print("❌ Bundle import failed")
+            return
         else:
             selected_charts = BIG_NUMBER_CHARTS
         
@@ -106,7 +128,11 @@ def main():
         processed_charts = chart_creator.process_charts(
             charts_config=selected_charts,
             dataset_id=DATASET_ID,
-            dashboard_title=DASHBOARD_TITLE
+            dashboard_title=DASHBOARD_TITLE,
+            max_workers=MAX_WORKERS,
+            reconcile=RECONCILE_MODE,
+            dry_run=DRY_RUN,
+            build_dashboard=AUTO_UPDATE_DASHBOARD
         )
         
         # Results
@@ -122,22 +148,16 @@ def analyze_working_chart(chart_creator, chart_name):
     print(f"\n🔍 Analyzing chart: {chart_name}")
     
     # Find the chart
-    resp = chart_creator.session.get(f"{chart_creator.superset_url}/api/v1/chart/", headers=chart_creator.headers)
-    if resp.status_code != 200:
-        print(f"❌ Failed to list charts: {resp.status_code}")
+    try:
+        chart_id = chart_creator.find_chart_id(chart_name)
+    except Exception as e:
+        print(f"❌ Failed to look up chart: {e}")
         return
     
-    charts = resp.json()["result"]
-    chart_id = None
-    for chart in charts:
-        if chart["slice_name"] == chart_name:
-            chart_id = chart["id"]
-            break
-    
     if not chart_id:
         print(f"❌ Chart '{chart_name}' not found")
         print("Available charts:")
-        for chart in charts[:10]:  # Show first 10
+        for chart in chart_creator.find_charts(columns=["slice_name"], limit=10):  # Show first 10
             print(f"   - {chart['slice_name']}")
         return
     
@@ -198,7 +218,9 @@ def analyze_working_chart(chart_creator, chart_name):
 
 def copy_basic_line_v1():
     """Copy the Basic Line v1 chart"""
-    auth = SupersetAuth(SUPERSET_CONFIG["url"], SUPERSET_CONFIG["username"], SUPERSET_CONFIG["password"])
+    auth = SupersetAuth(SUPERSET_CONFIG["url"], SUPERSET_CONFIG["username"], SUPERSET_CONFIG["password"],
+                        cache=MetadataCache(**CACHE_CONFIG), session_store=SessionStore(SESSION_STORE_PATH),
+                        scheduler=RequestScheduler(**SCHEDULER_CONFIG))
     auth.authenticate()
     chart_creator = SupersetChartCreator(auth)
     
@@ -206,7 +228,9 @@ def copy_basic_line_v1():
 
 def test_big_number():
     """Quick test function"""
-    auth = SupersetAuth(SUPERSET_CONFIG["url"], SUPERSET_CONFIG["username"], SUPERSET_CONFIG["password"])
+    auth = SupersetAuth(SUPERSET_CONFIG["url"], SUPERSET_CONFIG["username"], SUPERSET_CONFIG["password"],
+                        cache=MetadataCache(**CACHE_CONFIG), session_store=SessionStore(SESSION_STORE_PATH),
+                        scheduler=RequestScheduler(**SCHEDULER_CONFIG))
     auth.authenticate()
     chart_creator = SupersetChartCreator(auth)
     
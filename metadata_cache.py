@@ -0,0 +1,88 @@
+import json
+import sqlite3
+import threading
+import time
+
+class MetadataCache:
+    """Persistent SQLite cache for Superset metadata (datasets, chart and dashboard listings).
+
+    Entries are keyed by Superset URL + object type + object id. An entry younger than
+    `ttl` seconds is used without contacting Superset; older entries are revalidated
+    by the caller (changed_on probe or ETag) and either touched or replaced.
+    """
+
+    def __init__(self, path=".superset_cache.sqlite", ttl=3600):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS metadata (
+                superset_url TEXT NOT NULL,
+                object_type TEXT NOT NULL,
+                object_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                etag TEXT,
+                changed_on TEXT,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (superset_url, object_type, object_id)
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, superset_url, object_type, object_id):
+        """Return the cached entry as a dict (with a `fresh` flag) or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, etag, changed_on, fetched_at FROM metadata "
+                "WHERE superset_url = ? AND object_type = ? AND object_id = ?",
+                (superset_url, object_type, str(object_id))
+            ).fetchone()
+        if row is None:
+            return None
+        payload, etag, changed_on, fetched_at = row
+        return {
+            "payload": json.loads(payload),
+            "etag": etag,
+            "changed_on": changed_on,
+            "fetched_at": fetched_at,
+            "fresh": time.time() - fetched_at < self.ttl
+        }
+
+    def put(self, superset_url, object_type, object_id, payload, etag=None, changed_on=None):
+        """Store or replace an entry"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (superset_url, object_type, str(object_id), json.dumps(payload), etag, changed_on, time.time())
+            )
+            self._conn.commit()
+
+    def touch(self, superset_url, object_type, object_id, changed_on=None):
+        """Mark an entry as revalidated, restarting its TTL"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE metadata SET fetched_at = ?, changed_on = COALESCE(?, changed_on) "
+                "WHERE superset_url = ? AND object_type = ? AND object_id = ?",
+                (time.time(), changed_on, superset_url, object_type, str(object_id))
+            )
+            self._conn.commit()
+
+    def invalidate(self, superset_url, object_type, object_id=None):
+        """Drop one entry, or every entry of an object type when object_id is None"""
+        with self._lock:
+            if object_id is None:
+                self._conn.execute(
+                    "DELETE FROM metadata WHERE superset_url = ? AND object_type = ?",
+                    (superset_url, object_type)
+                )
+            else:
+                self._conn.execute(
+                    "DELETE FROM metadata WHERE superset_url = ? AND object_type = ? AND object_id = ?",
+                    (superset_url, object_type, str(object_id))
+                )
+            self._conn.commit()
+
+    def close(self):
+        """Close the SQLite connection"""
+        self._conn.close()
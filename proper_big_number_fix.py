@@ -6,7 +6,9 @@ The issue is that the chart is created but has an empty/invalid query.
 
 import json
 from auth import SupersetAuth
-from chart_configs import SUPERSET_CONFIG, DATASET_ID
+from chart_configs import SUPERSET_CONFIG, DATASET_ID, SESSION_STORE_PATH
+from session_store import SessionStore
+from superset_query import find_charts
 
 def analyze_working_chart():
     """Analyze a working chart to understand the correct payload structure"""
@@ -17,19 +19,19 @@ def analyze_working_chart():
         auth = SupersetAuth(
             superset_url=SUPERSET_CONFIG["url"],
             username=SUPERSET_CONFIG["username"], 
-            password=SUPERSET_CONFIG["password"]
+            password=SUPERSET_CONFIG["password"],
+            session_store=SessionStore(SESSION_STORE_PATH)
         )
         
         session, headers = auth.authenticate()
         
-        # Get all existing charts
-        resp = session.get(f"{SUPERSET_CONFIG['url']}/api/v1/chart/", headers=headers)
-        if resp.status_code != 200:
-            print("❌ Could not fetch charts")
+        # Look up a big_number chart server-side instead of scanning the full list
+        try:
+            charts = find_charts(session, SUPERSET_CONFIG['url'], headers, viz_type_contains='big_number', limit=1)
+        except Exception as e:
+            print(f"❌ Could not fetch charts: {e}")
             return None
         
-        charts = resp.json()["result"]
-        
         # Look for any working big_number charts
         for chart in charts:
             if 'big_number' in chart.get('viz_type', ''):
@@ -61,7 +63,8 @@ def create_chart_like_ui():
         auth = SupersetAuth(
             superset_url=SUPERSET_CONFIG["url"],
             username=SUPERSET_CONFIG["username"], 
-            password=SUPERSET_CONFIG["password"]
+            password=SUPERSET_CONFIG["password"],
+            session_store=SessionStore(SESSION_STORE_PATH)
         )
         
         session, headers = auth.authenticate()
@@ -232,7 +235,8 @@ def inspect_dataset_metrics():
         auth = SupersetAuth(
             superset_url=SUPERSET_CONFIG["url"],
             username=SUPERSET_CONFIG["username"], 
-            password=SUPERSET_CONFIG["password"]
+            password=SUPERSET_CONFIG["password"],
+            session_store=SessionStore(SESSION_STORE_PATH)
         )
         
         session, headers = auth.authenticate()
@@ -279,7 +283,8 @@ def create_count_metric_in_dataset():
         auth = SupersetAuth(
             superset_url=SUPERSET_CONFIG["url"],
             username=SUPERSET_CONFIG["username"], 
-            password=SUPERSET_CONFIG["password"]
+            password=SUPERSET_CONFIG["password"],
+            session_store=SessionStore(SESSION_STORE_PATH)
         )
         
         session, headers = auth.authenticate()
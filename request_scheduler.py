@@ -0,0 +1,257 @@
+import asyncio
+import email.utils
+import random
+import threading
+import time
+import requests
+
+# Responses meaning "not processed, try again later": rate limited or overloaded
+RETRY_STATUSES = {429, 503}
+# Gateway errors and network failures may hide a request the server did apply,
+# so they are only retried for methods that are safe to repeat
+IDEMPOTENT_RETRY_STATUSES = {502, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+def retry_after_seconds(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def backoff_delay(attempt, base=0.5, cap=30.0, retry_after=None):
+    """Delay before retry number attempt (0-based): Retry-After plus a little jitter, else full-jitter backoff"""
+    if retry_after is not None:
+        return retry_after + random.uniform(0, base)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def is_retryable(method, status=None, error=None):
+    """Whether a failed attempt (HTTP status, or a network error) may be sent again"""
+    idempotent = method.upper() in IDEMPOTENT_METHODS
+    if error is not None:
+        return idempotent
+    return status in RETRY_STATUSES or (idempotent and status in IDEMPOTENT_RETRY_STATUSES)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second on average, bursts of up to `burst`"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _take(self):
+        """Take a token and return 0, or return how long to wait for one"""
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while wait := self._take():
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold back every caller for `seconds`, e.g. after the server sent Retry-After"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for requests in flight.
+
+    Every healthy response adds 1/limit (about one slot per round of requests); an
+    overloaded or slower-than-latency_target response cuts the limit by `decrease`,
+    at most once per latency_target so one wave of failures counts once.
+    """
+
+    def __init__(self, initial=4, min_limit=1, max_limit=16, latency_target=10.0, decrease=0.5):
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.decrease = decrease
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Block until fewer than `limit` requests are in flight and take a slot"""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def _adjust(self, latency, overloaded):
+        """AIMD step for one finished request (called with the condition held)"""
+        self.in_flight -= 1
+        now = time.monotonic()
+        if overloaded or latency > self.latency_target:
+            if now - self._last_decrease >= self.latency_target:
+                previous = int(self.limit)
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+                self._last_decrease = now
+                if int(self.limit) < previous:
+                    cause = "is overloaded" if overloaded else f"took {latency:.1f}s"
+                    print(f"  🐢 Superset {cause}, concurrency {previous} -> {int(self.limit)}")
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def release(self, latency, overloaded=False):
+        """Return a slot and adjust the limit from how the request went"""
+        with self._cond:
+            self._adjust(latency, overloaded)
+            self._cond.notify_all()
+
+
+class RequestScheduler:
+    """Shared gate for all Superset HTTP calls of one server.
+
+    Requests pass a token bucket (rate limit) and an AIMD concurrency limiter; 429/503
+    responses (and gateway errors/network failures for idempotent methods) are retried
+    with jittered exponential backoff, honoring Retry-After. A Retry-After also pauses
+    the bucket, so other threads stop hammering the server too.
+    """
+
+    def __init__(self, rate=None, burst=None, max_concurrency=16, initial_concurrency=4, latency_target=10.0,
+                 max_retries=4, backoff=0.5, max_backoff=30.0, timeout=(10, 120)):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.limiter = AdaptiveLimiter(initial_concurrency, 1, max_concurrency, latency_target)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+
+    def _retry_delay(self, method, url, attempt, status, retry_after_header, error):
+        """Seconds to wait before resending a failed attempt, or None to give up"""
+        if attempt == self.max_retries or not is_retryable(method, status, error):
+            return None
+        retry_after = retry_after_seconds(retry_after_header)
+        delay = backoff_delay(attempt, self.backoff, self.max_backoff, retry_after)
+        if retry_after is not None and self.bucket:
+            self.bucket.pause(delay)
+        reason = type(error).__name__ if error is not None else status
+        print(f"  🔁 {method} {url.split('?')[0]} got {reason}, retry {attempt + 1}/{self.max_retries} in {delay:.1f}s...")
+        return delay
+
+    def send(self, method, url, send):
+        """Call send() (one HTTP attempt returning a response) under the limits, retrying as needed"""
+        for attempt in range(self.max_retries + 1):
+            if self.bucket:
+                self.bucket.acquire()
+            self.limiter.acquire()
+            started = time.monotonic()
+            resp = error = None
+            try:
+                resp = send()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            except Exception:
+                self.limiter.release(time.monotonic() - started)
+                raise
+            status = resp.status_code if resp is not None else None
+            failed = error is not None or status in RETRY_STATUSES | IDEMPOTENT_RETRY_STATUSES
+            self.limiter.release(time.monotonic() - started, overloaded=failed)
+
+            delay = None
+            if failed:
+                retry_after = resp.headers.get("Retry-After") if resp is not None else None
+                delay = self._retry_delay(method, url, attempt, status, retry_after, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return resp
+            if resp is not None:
+                resp.close()
+            time.sleep(delay)
+
+
+class AsyncTokenBucket(TokenBucket):
+    """TokenBucket whose acquire() waits without blocking the event loop"""
+
+    async def acquire(self):
+        while wait := self._take():
+            await asyncio.sleep(wait)
+
+
+class AsyncAdaptiveLimiter(AdaptiveLimiter):
+    """AdaptiveLimiter for coroutines, waiting on an asyncio.Condition"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency, overloaded=False):
+        async with self._cond:
+            self._adjust(latency, overloaded)
+            self._cond.notify_all()
+
+
+class AsyncRequestScheduler(RequestScheduler):
+    """RequestScheduler for aiohttp: same rate limit, AIMD limit and retry rules, awaited.
+
+    Its asyncio primitives belong to the event loop it is first used on.
+    """
+
+    def __init__(self, rate=None, burst=None, max_concurrency=16, initial_concurrency=4, latency_target=10.0,
+                 max_retries=4, backoff=0.5, max_backoff=30.0, timeout=(10, 120)):
+        super().__init__(None, None, max_concurrency, initial_concurrency, latency_target,
+                         max_retries, backoff, max_backoff, timeout)
+        self.bucket = AsyncTokenBucket(rate, burst) if rate else None
+        self.limiter = AsyncAdaptiveLimiter(initial_concurrency, 1, max_concurrency, latency_target)
+
+    async def send(self, method, url, send, network_errors=(OSError, asyncio.TimeoutError)):
+        """Await send() (one attempt returning (status, Retry-After header, result)) under the limits.
+
+        Returns the result of the last attempt; network_errors are the exceptions treated
+        like dropped connections (retried for idempotent methods only).
+        """
+        for attempt in range(self.max_retries + 1):
+            if self.bucket:
+                await self.bucket.acquire()
+            await self.limiter.acquire()
+            started = time.monotonic()
+            status = retry_after = result = error = None
+            try:
+                status, retry_after, result = await send()
+            except network_errors as e:
+                error = e
+            except BaseException:
+                await self.limiter.release(time.monotonic() - started)
+                raise
+            failed = error is not None or status in RETRY_STATUSES | IDEMPOTENT_RETRY_STATUSES
+            await self.limiter.release(time.monotonic() - started, overloaded=failed)
+
+            delay = self._retry_delay(method, url, attempt, status, retry_after, error) if failed else None
+            if delay is None:
+                if error is not None:
+                    raise error
+                return result
+            await asyncio.sleep(delay)
@@ -0,0 +1,86 @@
+import base64
+import contextlib
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+
+# Superset's default JWT lifetimes, used when a token carries no readable exp claim
+DEFAULT_ACCESS_TTL = 15 * 60
+DEFAULT_REFRESH_TTL = 30 * 24 * 3600
+
+
+def token_expiry(token, default_ttl):
+    """Return the exp claim of a JWT as a Unix timestamp (now + default_ttl if unreadable)"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, ValueError, TypeError):
+        return time.time() + default_ttl
+
+
+class SessionStore:
+    """JSON file holding Superset tokens, CSRF token and cookies per URL + username.
+
+    Lets short-lived processes reuse a login instead of repeating the three-request
+    login handshake. The file is written atomically and readable only by its owner;
+    read-modify-write cycles hold an exclusive lock on a side file, so concurrent
+    processes sharing the store don't drop each other's entries.
+    """
+
+    def __init__(self, path=".superset_session.json"):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Hold the in-process lock and an flock on <path>.lock (shared across processes)"""
+        with self._lock:
+            fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, data):
+        """Replace the file atomically with an owner-only (0600) copy of data"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)),
+                                        prefix=f"{os.path.basename(self.path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            raise
+
+    def load(self, superset_url, username):
+        """Return the stored session for this user, or None"""
+        with self._locked():
+            return self._read().get(f"{superset_url}|{username}")
+
+    def save(self, superset_url, username, entry):
+        """Store the session for this user"""
+        with self._locked():
+            data = self._read()
+            data[f"{superset_url}|{username}"] = entry
+            self._write(data)
+
+    def clear(self, superset_url, username):
+        """Forget the stored session for this user"""
+        with self._locked():
+            data = self._read()
+            if data.pop(f"{superset_url}|{username}", None) is not None:
+                self._write(data)
@@ -1,7 +1,9 @@
 # Script to create or update a single Superset chart for debugging
-from chart_configs import SUPERSET_CONFIG, DATASET_ID, CHARTS_CONFIG
+from chart_configs import SUPERSET_CONFIG, CACHE_CONFIG, SESSION_STORE_PATH, DATASET_ID, CHARTS_CONFIG
 from auth import SupersetAuth
 from chart_creator import SupersetChartCreator
+from metadata_cache import MetadataCache
+from session_store import SessionStore
 import sys
 
 if __name__ == "__main__":
@@ -22,10 +24,12 @@ if __name__ == "__main__":
         auth = SupersetAuth(
             superset_url=SUPERSET_CONFIG["url"],
             username=SUPERSET_CONFIG["username"],
-            password=SUPERSET_CONFIG["password"]
+            password=SUPERSET_CONFIG["password"],
+            cache=MetadataCache(**CACHE_CONFIG),
+            session_store=SessionStore(SESSION_STORE_PATH)
         )
         session, headers = auth.authenticate()
-        chart_creator = SupersetChartCreator(auth)
+        chart_creator = SupersetChartCreator(auth, debug=True)
         dataset_info = auth.get_dataset_info(DATASET_ID)
         if not dataset_info:
             print("❌ Could not fetch dataset info.")
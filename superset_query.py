@@ -0,0 +1,181 @@
+import asyncio
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+# Superset caps list endpoints at API_MAX_PAGE_SIZE (100 by default)
+DEFAULT_PAGE_SIZE = 100
+
+# Columns returned by chart lookups
+CHART_LOOKUP_COLUMNS = ["id", "slice_name", "viz_type", "datasource_id"]
+
+_RISON_ID = re.compile(r"^[A-Za-z_./~][-A-Za-z0-9_./~]*$")
+
+
+def rison_dumps(value):
+    """Encode a Python value as rison, the query format used by Superset's `q` parameter"""
+    if value is True:
+        return "!t"
+    if value is False:
+        return "!f"
+    if value is None:
+        return "!n"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, str):
+        if _RISON_ID.match(value):
+            return value
+        return "'" + value.replace("!", "!!").replace("'", "!'") + "'"
+    if isinstance(value, dict):
+        return "(" + ",".join(f"{rison_dumps(str(k))}:{rison_dumps(v)}" for k, v in value.items()) + ")"
+    if isinstance(value, (list, tuple)):
+        return "!(" + ",".join(rison_dumps(v) for v in value) + ")"
+    raise TypeError(f"Cannot rison-encode {type(value).__name__}")
+
+
+def build_query(columns=None, filters=None, page=0, page_size=DEFAULT_PAGE_SIZE,
+                order_column=None, order_direction=None):
+    """Build the rison `q` string for a Superset list endpoint"""
+    query = {}
+    if columns:
+        query["columns"] = list(columns)
+    if filters:
+        query["filters"] = list(filters)
+    if order_column:
+        query["order_column"] = order_column
+        query["order_direction"] = order_direction or "asc"
+    query["page"] = page
+    query["page_size"] = page_size
+    return rison_dumps(query)
+
+
+def make_filters(opr="eq", **conditions):
+    """Turn keyword conditions into Superset filter dicts, skipping None values"""
+    return [{"col": col, "opr": opr, "value": value} for col, value in conditions.items() if value is not None]
+
+
+def fetch_page(session, superset_url, headers, resource, page, **query):
+    """Fetch one page of a list endpoint and return its JSON body"""
+    resp = session.get(
+        f"{superset_url}/api/v1/{resource}/",
+        headers=headers,
+        params={"q": build_query(page=page, **query)}
+    )
+    if resp.status_code != 200:
+        raise Exception(f"Failed to list {resource} page {page}: {resp.status_code} - {resp.text}")
+    return resp.json()
+
+
+def iter_resource(session, superset_url, headers, resource, columns=None, filters=None,
+                  page_size=DEFAULT_PAGE_SIZE, max_workers=1, order_column="id"):
+    """Yield every row of a Superset list endpoint, page by page.
+
+    The first page reports the total count; with max_workers > 1 the remaining
+    pages are fetched concurrently, at most max_workers pages ahead of the consumer,
+    and still yielded in page order.
+    """
+    query = {"columns": columns, "filters": filters, "page_size": page_size, "order_column": order_column}
+    first = fetch_page(session, superset_url, headers, resource, 0, **query)
+    yield from first["result"]
+
+    total = first.get("count", len(first["result"]))
+    page_count = -(-total // page_size)
+    if page_count <= 1:
+        return
+
+    if max_workers <= 1:
+        for page in range(1, page_count):
+            yield from fetch_page(session, superset_url, headers, resource, page, **query)["result"]
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        pages = iter(range(1, page_count))
+        for page in pages:
+            pending.append(executor.submit(fetch_page, session, superset_url, headers, resource, page, **query))
+            if len(pending) >= max_workers:
+                break
+        while pending:
+            rows = pending.popleft().result()["result"]
+            next_page = next(pages, None)
+            if next_page is not None:
+                pending.append(executor.submit(fetch_page, session, superset_url, headers, resource, next_page, **query))
+            yield from rows
+
+
+def find_resources(session, superset_url, headers, resource, filters, columns=None, limit=None):
+    """Return the rows of a list endpoint matching server-side filters.
+
+    With a limit only the first `limit` matches are requested, so a single lookup
+    is one small request.
+    """
+    page_size = min(limit, DEFAULT_PAGE_SIZE) if limit else DEFAULT_PAGE_SIZE
+    rows = iter_resource(session, superset_url, headers, resource, columns=columns,
+                         filters=filters, page_size=page_size)
+    return list(islice(rows, limit) if limit else rows)
+
+
+def find_charts(session, superset_url, headers, slice_name=None, viz_type=None, datasource_id=None,
+                viz_type_contains=None, columns=CHART_LOOKUP_COLUMNS, limit=None):
+    """Look up charts by exact slice_name/viz_type/datasource_id (or viz_type substring) on the server"""
+    filters = make_filters(slice_name=slice_name, viz_type=viz_type, datasource_id=datasource_id)
+    filters += make_filters("ct", viz_type=viz_type_contains)
+    return find_resources(session, superset_url, headers, "chart", filters, columns=columns, limit=limit)
+
+
+def find_chart_id(session, superset_url, headers, slice_name):
+    """Return the ID of the chart named slice_name, or None"""
+    charts = find_charts(session, superset_url, headers, slice_name=slice_name, columns=["id"], limit=1)
+    return charts[0]["id"] if charts else None
+
+
+def fetch_changed_on(session, superset_url, headers, resource, object_id):
+    """Return the changed_on_utc of one object via a tiny filtered listing, or None"""
+    try:
+        rows = find_resources(session, superset_url, headers, resource, make_filters(id=object_id),
+                              columns=["changed_on_utc"], limit=1)
+    except Exception:
+        return None
+    return rows[0].get("changed_on_utc") if rows else None
+
+
+def fetch_listing_signature(session, superset_url, headers, resource):
+    """Return "<count>|<newest changed_on_utc>" for a list endpoint, or None.
+
+    Any create, update or delete changes the signature, so it is used to revalidate
+    cached listings with a single one-row request.
+    """
+    try:
+        page = fetch_page(session, superset_url, headers, resource, 0, columns=["changed_on_utc"], page_size=1,
+                          order_column="changed_on_delta_humanized", order_direction="desc")
+    except Exception:
+        return None
+    newest = page["result"][0].get("changed_on_utc") if page["result"] else ""
+    return f"{page.get('count', 0)}|{newest}"
+
+
+async def iter_resource_async(auth, resource, columns=None, filters=None,
+                              page_size=DEFAULT_PAGE_SIZE, max_workers=1, order_column="id"):
+    """Async variant of iter_resource for an AsyncSupersetAuth"""
+    query = {"columns": columns, "filters": filters, "page_size": page_size, "order_column": order_column}
+
+    async def fetch(page):
+        status, data, text = await auth.request(
+            "GET", f"/api/v1/{resource}/", params={"q": build_query(page=page, **query)}
+        )
+        if status != 200:
+            raise Exception(f"Failed to list {resource} page {page}: {status} - {text}")
+        return data
+
+    first = await fetch(0)
+    for row in first["result"]:
+        yield row
+
+    total = first.get("count", len(first["result"]))
+    page_count = -(-total // page_size)
+    for start in range(1, page_count, max(1, max_workers)):
+        batch = range(start, min(start + max(1, max_workers), page_count))
+        for data in await asyncio.gather(*(fetch(page) for page in batch)):
+            for row in data["result"]:
+                yield row